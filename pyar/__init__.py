@@ -17,16 +17,29 @@
 
 from .base import PyAR
 
-from .adapter import IAdapter, AAdapter, AAdapterConfig
+from .adapter import IAdapter, AAdapter, AAdapterConfig, AAsyncAdapter
+
+from .async_adapter import AsyncIAdapter
 
 from .model import AModel, AModelAdapter, AModelData, IModel, IModelData, IModelNew, IModelAdapter, ModelMetaRegister
 
+from .identity_map import IdentityMap
+
+from .query import SQLQuery, CompiledSQLQuery, SQLQuerySet
+
 from .sql_model import Relation, ASQLModel, ASQLModelFinder, ASQLModelLastData, ASQLModelPK, BelongToRelation, \
-    HasManyRelation, HasOneRelation
+    HasManyRelation, HasOneRelation, RelationCache, preload
 
 from .exception import AdapterConfigKeyException, AdapterExecuteException, AdapterNotExistsException, \
     AdapterTypeException, ModelFieldNameException, ModelTypeException, PyARException, ModelNotExistsException, \
-    RelationFieldNotExistsException, SQLAdapterExecuteException, SQLModelPartNotExistsException
+    RelationFieldNotExistsException, SQLAdapterExecuteException, SQLModelPartNotExistsException, \
+    PaginationCursorException
 
 from .adapters.jira import JiraReaderAdapter
-from .adapters.mysql import MySQLAdapter
\ No newline at end of file
+from .adapters.response_cache import CacheEntry, IResponseCache, MemoryResponseCache, SQLiteResponseCache
+from .adapters.mysql import MySQLAdapter, MySQLConnectionPool, MySQLQueryBuilder
+from .adapters.async_mysql import AsyncMySQLAdapter
+from .adapters.async_jira import AsyncJiraReaderAdapter
+from .adapters.routing import RoutingAdapter
+from .adapters.sharding import ShardedAdapter, IShardStrategy, HashShardStrategy, RangeShardStrategy, \
+    DirectoryShardStrategy
@@ -16,6 +16,7 @@
 """
 
 
+from .async_adapter import AsyncIAdapter
 from .exception import AdapterConfigKeyException, ModelTypeException
 from .model import IModel
 
@@ -32,6 +33,15 @@ class IAdapter(object):
         """
         pass
 
+    def iter_read(self, model_cls, **kwargs):
+        """Lazy read method.
+
+        :param model_cls: PyAR model class.
+        :type IModel
+        :rtype: iterator
+        """
+        pass
+
     def create(self, model, **kwargs):
         """Create model.
 
@@ -153,6 +163,16 @@ class AAdapter(AAdapterConfig, IAdapter):
         if not issubclass(model_cls, IModel):
             raise ModelTypeException('Model must be an instance of IModel')
 
+    def iter_read(self, model_cls, **kwargs):
+        """Lazy read method. Yields models of read method by default.
+
+        :param model_cls: PyAR model class.
+        :type IModel
+        :rtype: iterator
+        """
+        for model in self.read(model_cls, **kwargs):
+            yield model
+
     def create(self, model, **kwargs):
         """Create model.
 
@@ -179,3 +199,62 @@ class AAdapter(AAdapterConfig, IAdapter):
         :rtype: bool
         """
         self.__check_model_type(model)
+
+
+class AAsyncAdapter(AAdapterConfig, AsyncIAdapter):
+    """Abstract asynchronous adapter class."""
+
+    def __init__(self, **kwargs):
+        """Constructor.
+        Sets adapter's config.
+        """
+        super().__init__(**kwargs)
+
+    @staticmethod
+    def __check_model_type(model):
+        """Checks model type.
+
+        :param model: Methods model.
+        :type model: IModel
+        :rtype: None
+        """
+        if not isinstance(model, IModel):
+            raise ModelTypeException('Model must be an instance of IModel')
+
+    async def read(self, model_cls, **kwargs):
+        """Read method.
+
+        :param model_cls: PyAR model class.
+        :type IModel
+        :rtype: list
+        """
+        if not issubclass(model_cls, IModel):
+            raise ModelTypeException('Model must be an instance of IModel')
+
+    async def create(self, model, **kwargs):
+        """Create model.
+
+        :param model: PyAR model.
+        :type IModel
+        :rtype: bool
+        """
+        self.__check_model_type(model)
+
+    async def update(self, model, **kwargs):
+        """Update model.
+
+        :param model: PyAR model.
+        :type IModel
+        :rtype: bool
+        """
+        self.__check_model_type(model)
+
+    async def delete(self, model, **kwargs):
+        """Delete model.
+
+        :param model: PyAR model.
+        :type IModel
+        :rtype: bool
+        """
+        self.__check_model_type(model)
+
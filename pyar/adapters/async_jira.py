@@ -0,0 +1,183 @@
+"""
+    PyAR asynchronous JIRA reader adapter package.
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :license:
+        This code is a part of Communication Interface for Import/Export,
+        which is a proprietary subject of its rightful owners. Any form of
+        copy or distribution is forbidden without written permission.
+
+    :copyright:
+        Copyright (c) 2014 symmetrics - a CGI Group brand
+
+    :author:
+        symmetrics - a CGI Group brand <info@symmetrics.de>
+        Oleg Bronzov <oleg.bronzov@symmetrics.de>
+"""
+
+from ..adapter import AAsyncAdapter
+from ..exception import AdapterExecuteException
+from .jira import _AUrl
+
+import asyncio
+import contextvars
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncJiraReaderAdapter(_AUrl, AAsyncAdapter):
+    """PyAR asynchronous JIRA adapter backed by aiohttp.
+    Urls and paging of "_items_key_" models are the same as JiraReaderAdapter's ones.
+    """
+
+    def __init__(self, host, user=None, passwd=None, verify=False, timeout=60, pool_size=10, retries=3,
+                 backoff_factor=0.5, host_limit=None):
+        """Constructor. Sets adapter config. HTTP session is opened on first request.
+
+        :param host: Host path.
+        :type host: str
+        :param user: User name.
+        :type user: str
+        :param passwd: User password.
+        :type passwd: str
+        :param verify: Shows whether host certificate is verified.
+        :type verify: bool
+        :param timeout: Seconds to wait for the whole request. None means forever.
+        :type timeout: int|float
+        :param pool_size: Maximum number of opened connections.
+        :type pool_size: int
+        :param retries: Number of retries of failed connections and of 429/5xx responses.
+        :type retries: int
+        :param backoff_factor: Retries wait backoff_factor * 2 ^ (retry number - 1) seconds between attempts,
+        "Retry-After" header is respected.
+        :type backoff_factor: float
+        :param host_limit: Maximum number of concurrent requests per host. Defaults to pool_size.
+        :type host_limit: int
+        """
+        if aiohttp is None:
+            raise AdapterExecuteException('AsyncJiraReaderAdapter requires aiohttp package.')
+
+        self.__timeout = timeout
+        self.__pool_size = pool_size
+        self.__host_limit = host_limit if host_limit is not None else pool_size
+        self.__retries = retries
+        self.__backoff_factor = backoff_factor
+        self.__session = None
+        self.__last_response = contextvars.ContextVar('pyar_last_response_%d' % id(self), default=None)
+        super().__init__(host=host, user=user, passwd=passwd, verify=verify)
+
+    def get_session(self):
+        """Returns HTTP session. Opens it in the running event loop on first call.
+
+        :rtype: aiohttp.ClientSession
+        """
+        if self.__session is None or self.__session.closed:
+            connector = aiohttp.TCPConnector(limit=self.__pool_size, limit_per_host=self.__host_limit,
+                                             ssl=None if self.get_config('verify') else False)
+            auth = None
+
+            if self.has_config('user'):
+                passwd = self.get_config('passwd') if self.has_config('passwd') else ''
+                auth = aiohttp.BasicAuth(self.get_config('user'), passwd or '')
+
+            self.__session = aiohttp.ClientSession(connector=connector, auth=auth,
+                                                   timeout=aiohttp.ClientTimeout(total=self.__timeout))
+
+        return self.__session
+
+    async def close(self):
+        """Closes HTTP session.
+
+        :rtype: None
+        """
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    async def read(self, model_cls, page_size=50, **kwargs):
+        """Reads from jira with received parameters. All pages of paged resources are read.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: IModel
+        :param page_size: Number of items requested per page of paged resource.
+        :type page_size: int
+        :rtype: list
+        """
+        await super().read(model_cls, **kwargs)
+
+        items_key = getattr(model_cls, '_items_key_', None)
+
+        if items_key is None:
+            result = await self.fetch(self.get_url(model_cls.get_resource(), kwargs))
+            if isinstance(result, dict):
+                result = [result]
+            return [model_cls(item, False) for item in result]
+
+        params = dict(kwargs)
+        start = int(params.pop('startAt', 0))
+        params.setdefault('maxResults', page_size)
+        ret = []
+
+        while start is not None:
+            page = await self.fetch(self.get_url(model_cls.get_resource(), dict(params, startAt=start)))
+            items = page.get(items_key) or []
+            ret.extend([model_cls(item, False) for item in items])
+            start = self._get_next_start(page, start, len(items), int(params['maxResults']))
+
+        return ret
+
+    async def find_many(self, model_cls, queries):
+        """Reads several queries concurrently and returns their results in the order of queries.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: IModel
+        :param queries: Read parameters of every query.
+        :type queries: list<dict>
+        :rtype: list<list>
+        """
+        return list(await asyncio.gather(*[self.read(model_cls, **query) for query in queries]))
+
+    async def fetch(self, url):
+        """Sends GET request with retries and returns decoded response with status code 200.
+
+        :param url: Request url.
+        :type url: str
+        :rtype: dict|list
+        """
+        attempt = 0
+
+        while True:
+            retry_after = None
+
+            try:
+                async with self.get_session().get(url) as response:
+                    self.__last_response.set(response)
+
+                    if response.status == 200:
+                        return await response.json(content_type=None)
+
+                    if response.status not in (429, 500, 502, 503, 504) or attempt >= self.__retries:
+                        raise AdapterExecuteException('Can\'t read data. Status code: %s' % response.status)
+
+                    retry_after = response.headers.get('Retry-After')
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                if attempt >= self.__retries:
+                    raise AdapterExecuteException('Can\'t read data. %s' % exc)
+
+            attempt += 1
+            delay = self.__backoff_factor * 2 ** (attempt - 1)
+
+            if retry_after is not None and retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+
+            await asyncio.sleep(delay)
+
+    def get_last_response(self):
+        """Returns last response of the current task.
+
+        :rtype: aiohttp.ClientResponse
+        """
+        return self.__last_response.get()
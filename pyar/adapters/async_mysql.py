@@ -0,0 +1,333 @@
+"""
+    PyAR asynchronous MySQL adapter package.
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :license:
+        This code is a part of Communication Interface for Import/Export,
+        which is a proprietary subject of its rightful owners. Any form of
+        copy or distribution is forbidden without written permission.
+
+    :copyright:
+        Copyright (c) 2014 symmetrics - a CGI Group brand
+
+    :author:
+        symmetrics - a CGI Group brand <info@symmetrics.de>
+        Oleg Bronzov <oleg.bronzov@symmetrics.de>
+"""
+
+from ..adapter import AAsyncAdapter
+from ..exception import AdapterExecuteException, SQLAdapterExecuteException
+from .mysql import MySQLQueryBuilder
+
+import asyncio
+import contextvars
+import time
+
+import pymysql
+
+try:
+    import aiomysql
+except ImportError:
+    aiomysql = None
+
+
+class AsyncMySQLAdapter(AAsyncAdapter):
+    """PyAR asynchronous MySQL adapter backed by aiomysql connection pool.
+    Queries are built by the same MySQLQueryBuilder as MySQLAdapter's ones.
+    Transaction connection and last query are kept per asyncio task.
+    """
+
+    def __init__(self, schema_ttl=None, pool_min_size=1, pool_max_size=10, pool_recycle=3600,
+                 template_cache_size=512, **kwargs):
+        """Constructor. Sets adapter config. Connection pool is opened on first query.
+        Connections are opened in autocommit mode unless autocommit is specified.
+
+        :param schema_ttl: Seconds after which cached table columns are reloaded. None means never expire.
+        :param pool_min_size: Number of connections opened on start.
+        :param pool_max_size: Maximum number of opened connections.
+        :param pool_recycle: Seconds after which an idle connection is closed instead of reused. -1 means never.
+        :param template_cache_size: Maximum number of cached query templates.
+        :param kwargs: aiomysql.connect arguments (host, port, user, password, db, charset, ...).
+        """
+        if aiomysql is None:
+            raise AdapterExecuteException('AsyncMySQLAdapter requires aiomysql package.')
+
+        kwargs.setdefault('autocommit', True)
+        self.__schema_ttl = schema_ttl
+        self.__columns = dict()
+        self.__builder = MySQLQueryBuilder(template_cache_size)
+        self.__pool = None
+        self.__pool_lock = asyncio.Lock()
+        self.__pool_kwargs = dict(minsize=pool_min_size, maxsize=pool_max_size, pool_recycle=pool_recycle, **kwargs)
+        self.__transaction = contextvars.ContextVar('pyar_transaction_%d' % id(self), default=None)
+        self.__last = contextvars.ContextVar('pyar_last_%d' % id(self), default=(None, None, None))
+        super().__init__(**kwargs)
+
+    async def get_pool(self):
+        """Returns connection pool. Opens it on first call.
+
+        :rtype: aiomysql.Pool
+        """
+        if self.__pool is None:
+            async with self.__pool_lock:
+                if self.__pool is None:
+                    self.__pool = await aiomysql.create_pool(**self.__pool_kwargs)
+
+        return self.__pool
+
+    async def close(self):
+        """Closes connection pool.
+
+        :rtype: None
+        """
+        if self.__pool is not None:
+            self.__pool.close()
+            await self.__pool.wait_closed()
+            self.__pool = None
+
+    def get_query_builder(self):
+        """Returns query builder.
+
+        :rtype: MySQLQueryBuilder
+        """
+        return self.__builder
+
+    async def execute(self, query, cursor_type=None, args=None):
+        """Executes query and returns fetched rows.
+        Connection of the current task's transaction is used if there is one,
+        connection is taken from the pool for this query only otherwise.
+
+        :param query: Query string.
+        :type query: str
+        :param cursor_type: Cursor class.
+        :type cursor_type: type
+        :param args: Query arguments, which are bound by the driver to the "%(key)s" placeholders.
+        :type args: dict
+        :rtype: list
+        """
+        conn = self.__transaction.get()
+        pool = await self.get_pool()
+        acquired = conn is None
+
+        if acquired:
+            conn = await pool.acquire()
+
+        try:
+            cursor = await conn.cursor(cursor_type) if cursor_type is not None else await conn.cursor()
+            self.__last.set((query, args, cursor))
+
+            try:
+                await cursor.execute(query, args)
+                return list(await cursor.fetchall())
+            except pymysql.IntegrityError as exc:
+                raise SQLAdapterExecuteException(exc.args)
+            finally:
+                await cursor.close()
+        finally:
+            if acquired:
+                pool.release(conn)
+
+    async def read(self, model_cls, select=None, joins=None, where=None, having=None, limit=None, offset=None,
+                   distinct=False, group=None, order=None, params=dict(), query=None, use_index=None,
+                   force_index=None, raw=False, **kwargs):
+        """Build SQL query and execute it. Takes the same arguments as MySQLAdapter.read except streaming ones.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: IModel
+        :param raw: Returns rows as dicts (True or "dict") or tuples ("tuple") instead of models.
+        :type raw: bool|str
+        :rtype: list
+        """
+        await super().read(model_cls, **kwargs)
+
+        query, params = self.__builder.prepare_read(model_cls, params=params, query=query, keys=kwargs, select=select,
+                                                    joins=joins, where=where, having=having, limit=limit,
+                                                    offset=offset, distinct=distinct, group=group, order=order,
+                                                    use_index=use_index, force_index=force_index)
+
+        if raw == 'tuple':
+            return await self.execute(query, aiomysql.Cursor, params)
+
+        rows = await self.execute(query, aiomysql.DictCursor, params)
+
+        if raw:
+            return rows
+
+        models = [model_cls(row, False) for row in rows]
+
+        for model in models:
+            model.mark_clean()
+
+        return models
+
+    def get_last_query(self):
+        """Returns last query of the current task with bound arguments.
+
+        :rtype: str
+        """
+        query, args, cursor = self.__last.get()
+
+        if args is not None and cursor is not None:
+            return getattr(cursor, '_executed', None) or query
+
+        return query
+
+    def get_last_result(self):
+        """Returns cursor of the last query of the current task.
+
+        :rtype: Cursor
+        """
+        return self.__last.get()[2]
+
+    def in_transaction(self):
+        """Returns whether the current task has open transaction.
+
+        :rtype: bool
+        """
+        return self.__transaction.get() is not None
+
+    async def get_columns(self, resource):
+        """Returns table columns information.
+        Columns are loaded once per resource and cached until invalidated or expired.
+
+        :param resource: Resource (table) name.
+        :type resource: str
+        :rtype: dict
+        """
+        entry = self.__columns.get(resource)
+
+        if entry is None or (self.__schema_ttl is not None and time.time() - entry[0] > self.__schema_ttl):
+            rows = await self.execute('SHOW COLUMNS FROM %s' % resource, aiomysql.DictCursor)
+            entry = (time.time(), dict((row['Field'], row) for row in rows))
+            self.__columns[resource] = entry
+
+        return entry[1]
+
+    def invalidate_columns(self, resource=None):
+        """Removes cached columns information of the resource or of all resources if resource is not specified.
+
+        :param resource: Resource (table) name.
+        :type resource: str
+        :rtype: None
+        """
+        if resource is None:
+            self.__columns = dict()
+        else:
+            self.__columns.pop(resource, None)
+
+    async def __get_model_data(self, model, dirty=False):
+        """Returns filtered and escaped model's data.
+
+        :param model: PyAR sql model.
+        :type model: ASQLModel
+        :param dirty: Returns only fields changed since the model was loaded or saved.
+        :type dirty: bool
+        :rtype: dict
+        """
+        columns = await self.get_columns(model.get_resource())
+        data = model.get_dirty_data() if dirty else model.get_data(False)
+        return pymysql.escape_dict(dict((key, value) for key, value in data.items() if key in columns), "'")
+
+    async def start_transaction(self):
+        """Takes connection for the current task and starts transaction on it.
+
+        :rtype: None
+        """
+        if self.__transaction.get() is not None:
+            raise SQLAdapterExecuteException('Transaction is already started.')
+
+        pool = await self.get_pool()
+        conn = await pool.acquire()
+
+        try:
+            await conn.begin()
+        except Exception:
+            pool.release(conn)
+            raise
+
+        self.__transaction.set(conn)
+        self.__last.set(('START TRANSACTION', None, None))
+
+    async def commit_transaction(self):
+        """Commits transaction of the current task and returns its connection to the pool.
+
+        :rtype: None
+        """
+        await self.__finish_transaction('COMMIT')
+
+    async def rollback_transaction(self):
+        """Rolls back transaction of the current task and returns its connection to the pool.
+
+        :rtype: None
+        """
+        await self.__finish_transaction('ROLLBACK')
+
+    async def __finish_transaction(self, statement):
+        """Commits or rolls back transaction of the current task.
+
+        :param statement: COMMIT or ROLLBACK.
+        :type statement: str
+        :rtype: None
+        """
+        conn = self.__transaction.get()
+
+        if conn is None:
+            return
+
+        try:
+            if statement == 'COMMIT':
+                await conn.commit()
+            else:
+                await conn.rollback()
+        finally:
+            self.__transaction.set(None)
+            (await self.get_pool()).release(conn)
+
+        self.__last.set((statement, None, None))
+
+    async def create(self, model):
+        """Create model.
+
+        :param model: PyAR model.
+        :type model: ASQLModel
+        :rtype: bool
+        """
+        await super().create(model)
+
+        data = await self.__get_model_data(model)
+
+        if not len(data):
+            raise SQLAdapterExecuteException('Nothing to insert.')
+
+        await self.execute(self.__builder.build_insert(model.get_resource(), data))
+        return True
+
+    async def update(self, model):
+        """Update changed columns of the model.
+        Returns False without querying the database if no column was changed.
+
+        :param model: PyAR model.
+        :type ASQLModel
+        :rtype: bool
+        """
+        await super().update(model)
+
+        data = await self.__get_model_data(model, True)
+
+        if not len(data):
+            return False
+
+        await self.execute(self.__builder.build_update(model.get_resource(), data, model.get_pk(), model.get_id()))
+        return True
+
+    async def delete(self, model):
+        """Delete model.
+
+        :param model: PyAR model.
+        :type ASQLModel
+        :rtype: bool
+        """
+        await super().delete(model)
+
+        await self.execute(self.__builder.build_delete(model.get_resource(), model.get_pk(), model.get_id()))
+        return True
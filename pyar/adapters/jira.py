@@ -15,14 +15,24 @@
         Oleg Bronzov <oleg.bronzov@symmetrics.de>
 """
 
-from ..adapter import AAdapter
+from ..adapter import AAdapter, AAdapterConfig
 from ..model import IModel
 from ..exception import AdapterExecuteException
 
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .response_cache import CacheEntry
 
 
-class _AUrl(AAdapter):
+class _AUrl(AAdapterConfig):
     """JIRA adapter url helper."""
 
     def get_url(self, resource, params):
@@ -43,6 +53,33 @@ class _AUrl(AAdapter):
 
         return url
 
+    @staticmethod
+    def _get_next_start(page, start, count, max_results):
+        """Returns "startAt" of the next page or None if the page is the last one.
+
+        :param page: Decoded page.
+        :type page: dict
+        :param start: "startAt" of the page.
+        :type start: int
+        :param count: Number of items of the page.
+        :type count: int
+        :param max_results: Requested number of items.
+        :type max_results: int
+        :rtype: int|None
+        """
+        if not count or page.get('isLast'):
+            return None
+
+        next_start = int(page.get('startAt', start)) + count
+
+        if page.get('total') is not None:
+            return next_start if next_start < int(page['total']) else None
+
+        if 'isLast' not in page and count < int(page.get('maxResults', max_results)):
+            return None
+
+        return next_start
+
     @staticmethod
     def __add_last_slash(url):
         """Adds slash to the end of the url.
@@ -54,11 +91,25 @@ class _AUrl(AAdapter):
         return url + '/' if url[-1:] != '/' else url
 
 
-class JiraReaderAdapter(_AUrl):
-    """PyAR JIRA adapter."""
+class JiraReaderAdapter(_AUrl, AAdapter):
+    """PyAR JIRA adapter.
+    Models of paged resources (e.g. "search") declare key of the items list of the page:
+
+        class Issue(AModel):
+            _resource_ = 'search'
+            _items_key_ = 'issues'
+
+    Such resources are read page by page with "startAt" and "maxResults" parameters.
+
+    Responses are cached if the adapter has a cache. Models may override cache TTL with "_cache_ttl_" attribute,
+    0 disables caching of the model.
+    """
 
-    def __init__(self, host, user=None, passwd=None, verify=False):
-        """Constructor. Sets adapter config.
+    def __init__(self, host, user=None, passwd=None, verify=False, timeout=60, pool_size=10, retries=3,
+                 backoff_factor=0.5, workers=10, host_limit=None, cache=None, cache_ttl=300):
+        """Constructor. Sets adapter config and opens HTTP connection pool.
+        Every thread uses its own HTTP session, since sessions aren't thread safe,
+        and all sessions share the connection pool, which keeps connections alive.
 
         :param host: Host path.
         :type host: str
@@ -68,48 +119,329 @@ class JiraReaderAdapter(_AUrl):
         :type passwd: str
         :param verify: Shows whether requests lib will be verify host.
         :type verify: bool
+        :param timeout: Seconds to wait for connection and for response data, or tuple of both. None means forever.
+        :type timeout: int|float|tuple
+        :param pool_size: Maximum number of kept alive connections per host.
+        :type pool_size: int
+        :param retries: Number of retries of failed connections and of 429/5xx responses.
+        :type retries: int
+        :param backoff_factor: Retries wait backoff_factor * 2 ^ (retry number - 1) seconds between attempts,
+        "Retry-After" header is respected.
+        :type backoff_factor: float
+        :param workers: Number of threads of find_many.
+        :type workers: int
+        :param host_limit: Maximum number of concurrent requests per host. Defaults to pool_size.
+        :type host_limit: int
+        :param cache: Response cache. None disables caching.
+        :type cache: IResponseCache
+        :param cache_ttl: Seconds while cached response is used without request.
+        Expired responses are revalidated with "If-None-Match" and "If-Modified-Since" headers.
+        :type cache_ttl: int
         """
-        self.__last_response = None
+        self.__local = threading.local()
+        self.__timeout = timeout
+        self.__workers = workers
+        self.__executor = None
+        self.__host_limit = host_limit if host_limit is not None else pool_size
+        self.__host_semaphores = dict()
+        self.__lock = threading.Lock()
+        self.__cache = cache
+        self.__cache_ttl = cache_ttl
+        self.__cache_stats = dict()
         super().__init__(host=host, user=user, passwd=passwd, verify=verify)
+        retry = Retry(total=retries, backoff_factor=backoff_factor, status_forcelist=(429, 500, 502, 503, 504),
+                      raise_on_status=False, respect_retry_after_header=True)
+        self.__http_adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    def __create_session(self):
+        """Creates HTTP session which uses shared connection pool and retries.
+
+        :rtype: Session
+        """
+        session = requests.Session()
+        session.mount('http://', self.__http_adapter)
+        session.mount('https://', self.__http_adapter)
+        session.verify = self.get_config('verify')
+
+        if self.has_config('user'):
+            session.auth = (self.get_config('user'), self.get_config('passwd'))
+
+        return session
+
+    def get_session(self):
+        """Returns HTTP session of the current thread. Creates it on first call.
+
+        :rtype: Session
+        """
+        session = getattr(self.__local, 'session', None)
+
+        if session is None:
+            session = self.__local.session = self.__create_session()
+
+        return session
+
+    def close(self):
+        """Closes kept alive connections and stops find_many threads.
+
+        :rtype: None
+        """
+        with self.__lock:
+            if self.__executor is not None:
+                self.__executor.shutdown(wait=False)
+                self.__executor = None
+
+        self.__http_adapter.close()
+
+    def find_many(self, model_cls, queries):
+        """Reads several queries in parallel and returns their results in the order of queries:
+
+            issues, projects = adapter.find_many(Issue, [{'jql': 'project = A'}, {'jql': 'project = B'}])
+
+        :param model_cls: PyAR model class.
+        :type model_cls: IModel
+        :param queries: Read parameters of every query.
+        :type queries: list<dict>
+        :rtype: list<list>
+        """
+        queries = list(queries)
+
+        if len(queries) <= 1:
+            return [self.read(model_cls, **query) for query in queries]
+
+        return list(self.__get_executor().map(lambda query: self.read(model_cls, **query), queries))
+
+    def __get_executor(self):
+        """Returns thread pool of find_many.
+
+        :rtype: ThreadPoolExecutor
+        """
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(self.__workers)
+            return self.__executor
 
-    def read(self, model_cls, **kwargs):
+    def __get_host_semaphore(self, url):
+        """Returns semaphore which limits concurrent requests to the host of url.
+
+        :param url: Request url.
+        :type url: str
+        :rtype: Semaphore
+        """
+        host = urlparse(url).netloc
+
+        with self.__lock:
+            if host not in self.__host_semaphores:
+                self.__host_semaphores[host] = threading.BoundedSemaphore(self.__host_limit)
+            return self.__host_semaphores[host]
+
+    def read(self, model_cls, page_size=50, **kwargs):
         """Reads from jira with received parameters.
+        All pages of paged resources are read.
 
         :param model_cls: PyAR model class.
         :type model_cls: IModel
+        :param page_size: Number of items requested per page of paged resource.
+        :type page_size: int
         :rtype: list
         """
-        params = {
-            'verify': self.get_config('verify')
-        }
-        if self.has_config('user'):
-            params['auth'] = (
-                self.get_config('user'),
-                self.get_config('passwd')
-            )
-
-        self.__last_response = requests.get(
-            self.get_url(model_cls.get_resource(), kwargs),
-            **params
-        )
+        if getattr(model_cls, '_items_key_', None) is not None:
+            return list(self.iter_read(model_cls, page_size, **kwargs))
+
+        result = self.fetch(self.get_url(model_cls.get_resource(), kwargs), model_cls.get_resource(),
+                            self.__get_cache_ttl(model_cls))
+
+        if isinstance(result, dict):
+            result = [result]
+
+        return [model_cls(item, False) for item in result]
+
+    def iter_read(self, model_cls, page_size=50, prefetch=False, **kwargs):
+        """Reads from jira with received parameters and yields models.
+        Pages of paged resources are requested one by one while iterating.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: IModel
+        :param page_size: Number of items requested per page of paged resource.
+        :type page_size: int
+        :param prefetch: Requests next page in background thread while the current one is processed.
+        :type prefetch: bool
+        :rtype: iterator
+        """
+        items_key = getattr(model_cls, '_items_key_', None)
+
+        if items_key is None:
+            yield from self.read(model_cls, **kwargs)
+            return
+
+        for page in self.__iter_pages(model_cls.get_resource(), items_key, page_size, prefetch, kwargs,
+                                      self.__get_cache_ttl(model_cls)):
+            for item in page:
+                yield model_cls(item, False)
+
+    def __iter_pages(self, resource, items_key, page_size, prefetch, params, cache_ttl):
+        """Requests pages of paged resource and yields their items.
+
+        :param resource: Resource name.
+        :type resource: str
+        :param items_key: Key of the items list of the page.
+        :type items_key: str
+        :param page_size: Number of items requested per page.
+        :type page_size: int
+        :param prefetch: Requests next page in background thread.
+        :type prefetch: bool
+        :param params: Url params.
+        :type params: dict
+        :param cache_ttl: Cache TTL of pages.
+        :type cache_ttl: int
+        :rtype: iterator
+        """
+        params = dict(params)
+        start = int(params.pop('startAt', 0))
+        params.setdefault('maxResults', page_size)
+
+        def fetch(start_at):
+            return self.fetch(self.get_url(resource, dict(params, startAt=start_at)), resource, cache_ttl)
+
+        executor = ThreadPoolExecutor(1) if prefetch else None
+        future = None
+
+        try:
+            page = fetch(start)
+
+            while True:
+                items = page.get(items_key) or []
+                next_start = self._get_next_start(page, start, len(items), int(params['maxResults']))
+
+                if next_start is not None and executor is not None:
+                    future = executor.submit(fetch, next_start)
+
+                yield items
+
+                if next_start is None:
+                    break
+
+                page = future.result() if future is not None else fetch(next_start)
+                future = None
+                start = next_start
+        finally:
+            if executor is not None:
+                if future is not None:
+                    future.cancel()
+                executor.shutdown(wait=False)
+
+    def __get_cache_ttl(self, model_cls):
+        """Returns cache TTL of the model.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: IModel
+        :rtype: int
+        """
+        ttl = getattr(model_cls, '_cache_ttl_', None)
+        return ttl if ttl is not None else self.__cache_ttl
+
+    def fetch(self, url, resource=None, cache_ttl=None):
+        """Returns decoded response of url. Uses the cache if the adapter has one and cache_ttl is positive.
+
+        :param url: Request url.
+        :type url: str
+        :param resource: Resource name, which cache statistics are counted for.
+        :type resource: str
+        :param cache_ttl: Seconds while cached response is used without request.
+        :type cache_ttl: int
+        :rtype: dict|list
+        """
+        if self.__cache is None or not cache_ttl:
+            return self.request(url).json()
+
+        entry = self.__cache.get(url)
+        now = time.time()
+
+        if entry is not None and entry.expires > now:
+            self.__count_cache(resource, 'hits')
+            return json.loads(entry.body)
+
+        headers = dict()
+
+        if entry is not None and entry.etag is not None:
+            headers['If-None-Match'] = entry.etag
+        if entry is not None and entry.last_modified is not None:
+            headers['If-Modified-Since'] = entry.last_modified
+
+        response = self.request(url, headers)
+
+        if response.status_code == 304:
+            self.__count_cache(resource, 'revalidated')
+            self.__cache.set(url, entry._replace(expires=now + cache_ttl))
+            return json.loads(entry.body)
+
+        self.__count_cache(resource, 'misses')
+        self.__cache.set(url, CacheEntry(response.text, response.headers.get('ETag'),
+                                         response.headers.get('Last-Modified'), now + cache_ttl))
+        return response.json()
+
+    def __count_cache(self, resource, counter):
+        """Increments cache statistics counter of the resource.
+
+        :param resource: Resource name.
+        :type resource: str
+        :param counter: Counter name (hits, revalidated, misses).
+        :type counter: str
+        :rtype: None
+        """
+        with self.__lock:
+            stats = self.__cache_stats.setdefault(resource, {'hits': 0, 'revalidated': 0, 'misses': 0})
+            stats[counter] += 1
 
-        ret = []
+    def get_cache_stats(self):
+        """Returns cache statistics keyed by resource: hits, revalidated, misses and hit_rate.
+        Revalidated responses are counted as hits in hit_rate, since their bodies aren't downloaded.
+
+        :rtype: dict
+        """
+        with self.__lock:
+            ret = dict()
+            for resource, stats in self.__cache_stats.items():
+                total = stats['hits'] + stats['revalidated'] + stats['misses']
+                ret[resource] = dict(stats, hit_rate=(stats['hits'] + stats['revalidated']) / total if total else 0.0)
+            return ret
+
+    def clear_cache(self):
+        """Removes all cached responses and statistics.
+
+        :rtype: None
+        """
+        if self.__cache is not None:
+            self.__cache.clear()
+
+        with self.__lock:
+            self.__cache_stats = dict()
+
+    def request(self, url, headers=None):
+        """Sends GET request and returns response with status code 200,
+        or 304 if conditional headers are given.
+
+        :param url: Request url.
+        :type url: str
+        :param headers: Request headers.
+        :type headers: dict
+        :rtype: Response
+        """
+        try:
+            with self.__get_host_semaphore(url):
+                response = self.get_session().get(url, headers=headers, timeout=self.__timeout)
+        except requests.RequestException as exc:
+            raise AdapterExecuteException('Can\'t read data. %s' % exc)
 
-        if self.__last_response.status_code == 200:
-            result = self.__last_response.json()
-            if isinstance(result, dict):
-                result = [result]
+        self.__local.last_response = response
 
-            for item in result:
-                ret.append(model_cls(item, False))
-        else:
-            raise AdapterExecuteException('Can\'t read data. Status code: %s' % self.__last_response.status_code)
+        if response.status_code != 200 and not (headers and response.status_code == 304):
+            raise AdapterExecuteException('Can\'t read data. Status code: %s' % response.status_code)
 
-        return ret
+        return response
 
     def get_last_response(self):
-        """Returns last response.
+        """Returns last response of the current thread.
 
         :rtype: Response
         """
-        return self.__last_response
\ No newline at end of file
+        return getattr(self.__local, 'last_response', None)
@@ -20,16 +20,442 @@ from ..model import IModel
 from ..exception import SQLAdapterExecuteException
 
 import pymysql
+from pymysql.converters import escape_item
 import re
 import copy
+import time
+import threading
+import collections
+
+
+class MySQLConnectionPool(object):
+    """Bounded pool of MySQL connections.
+    Connections can be taken explicitly (acquire/release) or bound to the current thread (checkout/checkin).
+    """
+
+    def __init__(self, min_size=1, max_size=10, recycle=3600, ping=True, ping_interval=30, timeout=None, **kwargs):
+        """Constructor. Opens min_size connections.
+
+        :param min_size: Number of connections opened on start.
+        :type min_size: int
+        :param max_size: Maximum number of opened connections.
+        :type max_size: int
+        :param recycle: Seconds after which an idle connection is closed instead of reused. None means never.
+        :type recycle: int
+        :param ping: Shows whether connection is checked (and reconnected) when it's taken from the pool.
+        :type ping: bool
+        :param ping_interval: Seconds a connection may stay idle before it's checked. Fresher ones are reused as is.
+        :type ping_interval: int
+        :param timeout: Seconds to wait for a free connection. None means wait forever.
+        :type timeout: int
+        :param kwargs: pymysql.connect arguments.
+        :type kwargs: dict
+        """
+        if max_size < 1 or min_size > max_size:
+            raise SQLAdapterExecuteException('Invalid pool size [%s, %s].' % (min_size, max_size))
+
+        self.__kwargs = kwargs
+        self.__max_size = max_size
+        self.__recycle = recycle
+        self.__ping = ping
+        self.__ping_interval = ping_interval
+        self.__timeout = timeout
+        self.__idle = []
+        self.__size = 0
+        self.__closed = False
+        self.__cond = threading.Condition()
+        self.__local = threading.local()
+
+        for i in range(min_size):
+            self.__idle.append((pymysql.connect(**kwargs), time.time()))
+            self.__size += 1
+
+    def acquire(self):
+        """Takes connection from the pool.
+        Opens new connection if there is no idle one and the pool isn't full, waits for a free one otherwise.
+
+        :rtype: Connection
+        """
+        deadline = None if self.__timeout is None else time.time() + self.__timeout
+
+        with self.__cond:
+            while not self.__idle and self.__size >= self.__max_size:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    raise SQLAdapterExecuteException('Connection pool is exhausted.')
+                self.__cond.wait(remaining)
+
+            if self.__idle:
+                conn, released_at = self.__idle.pop()
+            else:
+                conn, released_at = None, None
+                self.__size += 1
+
+        try:
+            if conn is not None and self.__recycle is not None and time.time() - released_at > self.__recycle:
+                conn.close()
+                conn = None
+
+            if conn is not None and self.__ping and time.time() - released_at > self.__ping_interval:
+                try:
+                    conn.ping(reconnect=True)
+                except pymysql.Error:
+                    conn.close()
+                    conn = None
+
+            if conn is None:
+                conn = pymysql.connect(**self.__kwargs)
+        except Exception:
+            with self.__cond:
+                self.__size -= 1
+                self.__cond.notify()
+            raise
+
+        return conn
+
+    def release(self, conn):
+        """Returns connection to the pool.
+
+        :param conn: Connection taken by acquire.
+        :type conn: Connection
+        :rtype: None
+        """
+        with self.__cond:
+            if self.__closed:
+                self.__size -= 1
+                conn.close()
+            else:
+                self.__idle.append((conn, time.time()))
+            self.__cond.notify()
+
+    def discard(self, conn):
+        """Closes connection taken by acquire and frees its place in the pool.
+
+        :param conn: Connection taken by acquire.
+        :type conn: Connection
+        :rtype: None
+        """
+        with self.__cond:
+            self.__size -= 1
+            self.__cond.notify()
+        conn.close()
+
+    def checkout(self):
+        """Returns connection bound to the current thread. Acquires and binds it if there isn't one.
+
+        :rtype: Connection
+        """
+        conn = getattr(self.__local, 'conn', None)
+
+        if conn is None:
+            conn = self.acquire()
+            self.__local.conn = conn
+
+        return conn
+
+    def checkin(self):
+        """Releases connection bound to the current thread.
+
+        :rtype: None
+        """
+        conn = getattr(self.__local, 'conn', None)
+
+        if conn is not None:
+            self.__local.conn = None
+            self.release(conn)
+
+    def get_size(self):
+        """Returns number of opened connections.
+
+        :rtype: int
+        """
+        return self.__size
+
+    def close(self):
+        """Closes all idle connections. Connections in use are closed when they are released.
+
+        :rtype: None
+        """
+        with self.__cond:
+            self.__closed = True
+            for conn, released_at in self.__idle:
+                self.__size -= 1
+                conn.close()
+            self.__idle = []
+
+
+class MySQLQueryBuilder(object):
+    """Builds MySQL queries. It's shared by synchronous and asynchronous MySQL adapters."""
+
+    __placeholder_pattern = re.compile(r"""('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`[^`]*`)|(?<![:\w]):([A-Za-z_]\w*)|%""")
+    "Matches quoted literals, :key placeholders and percent signs of a query."
+
+    def __init__(self, template_cache_size=512):
+        """Constructor.
+
+        :param template_cache_size: Maximum number of cached query templates.
+        :type template_cache_size: int
+        """
+        self.__templates = collections.OrderedDict()
+        self.__templates_lock = threading.Lock()
+        self.__template_cache_size = template_cache_size
+        self.__template_hits = 0
+        self.__template_misses = 0
+
+    def build_read_query(self, model_cls, select=None, joins=None, where=None, having=None, limit=None, offset=None,
+                         distinct=False, group=None, order=None, use_index=None, force_index=None, keys=()):
+        """Builds SQL query with ":key" placeholders. Takes the same arguments as read.
+        use_index and force_index can't be combined, MySQL rejects both hints for the same table.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: IModel
+        :param keys: Names of fields compared for equality with ":key" placeholders.
+        :type keys: list
+        :rtype: str
+        """
+        if use_index is not None and force_index is not None:
+            raise SQLAdapterExecuteException('use_index and force_index can not be combined.')
+
+        return 'SELECT' \
+               '%s' \
+               '%s' \
+               'FROM %s' \
+               '%s' \
+               '%s' \
+               '%s' \
+               '%s' \
+               '%s' \
+               '%s' \
+               '%s' \
+               '%s' % (
+                   ' DISTINCT' if distinct else '',
+                   ' %s ' % select if select is not None else ' %s.* ' % model_cls.get_resource(),
+                   model_cls.get_resource(),
+                   self.__build_index_hint('USE', use_index) + self.__build_index_hint('FORCE', force_index),
+                   ' ' + joins if joins is not None else '',
+                   self.__build_read_where(where, model_cls.get_resource(), keys),
+                   ' GROUP BY ' + group if group is not None else '',
+                   ' HAVING ' + having if having is not None else '',
+                   self.__build_order(order),
+                   ' LIMIT ' + str(limit) if limit is not None else '',
+                   ' OFFSET ' + str(offset) if offset is not None else '',
+               )
+
+    def compile_read(self, model_cls, **kwargs):
+        """Builds SQL query and translates all its ":key" placeholders into driver's placeholders.
+        Takes the same arguments as build_read_query.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: IModel
+        :rtype: tuple(str, frozenset)
+        """
+        query = self.build_read_query(model_cls, **kwargs)
+        keys = frozenset([match.group(2) for match in self.__placeholder_pattern.finditer(query)
+                          if match.group(2) is not None])
+
+        return self.get_query_template(query, keys) if len(keys) else query, keys
+
+    def prepare_read(self, model_cls, params=dict(), query=None, keys=dict(), **kwargs):
+        """Returns query template and its parameters of read. Takes the same arguments as build_read_query.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: IModel
+        :param params: Query parameters.
+        :type params: dict
+        :param query: Full sql query, which is used instead of the built one.
+        :type query: str
+        :param keys: Fields compared for equality with the values of the same name.
+        :type keys: dict
+        :rtype: tuple(str, dict|None)
+        """
+        if query is None:
+            query = self.build_read_query(model_cls, keys=keys.keys(), **kwargs)
+
+        params = dict(params, **keys)
+
+        if not len(params):
+            return query, None
+
+        return self.get_query_template(query, frozenset(params.keys())), params
+
+    @staticmethod
+    def build_insert(resource, data):
+        """Builds "INSERT" query.
+
+        :param resource: Resource (table) name.
+        :type resource: str
+        :param data: Escaped column values keyed by column name.
+        :type data: dict
+        :rtype: str
+        """
+        return 'INSERT INTO %s (%s) VALUES (%s)' % (resource, ','.join(data.keys()), ','.join(data.values()))
+
+    @staticmethod
+    def build_update(resource, data, pk, id):
+        """Builds "UPDATE" query of one row.
+
+        :param resource: Resource (table) name.
+        :type resource: str
+        :param data: Escaped column values keyed by column name.
+        :type data: dict
+        :param pk: Primary key name.
+        :type pk: str
+        :param id: Primary key value.
+        :type id: int|str
+        :rtype: str
+        """
+        return 'UPDATE %s SET %s WHERE %s = %s' % (
+            resource,
+            ', '.join(['%s = %s' % (key, value) for key, value in data.items()]),
+            pk,
+            pymysql.escape_string(str(id)),
+        )
+
+    @staticmethod
+    def build_delete(resource, pk, id):
+        """Builds "DELETE" query of one row.
+
+        :param resource: Resource (table) name.
+        :type resource: str
+        :param pk: Primary key name.
+        :type pk: str
+        :param id: Primary key value.
+        :type id: int|str
+        :rtype: str
+        """
+        return 'DELETE FROM %s WHERE %s = %s LIMIT 1' % (resource, pk, pymysql.escape_string(str(id)))
+
+    def get_query_template(self, query, keys):
+        """Translates ":key" placeholders of the query into driver's "%(key)s" placeholders.
+        Placeholders without a key and quoted literals are left untouched.
+        Translated templates are kept in LRU cache.
+
+        :param query: Query string.
+        :type query: str
+        :param keys: Parameter keys.
+        :type keys: frozenset
+        :rtype: str
+        """
+        cache_key = (query, keys)
+
+        with self.__templates_lock:
+            template = self.__templates.get(cache_key)
+            if template is not None:
+                self.__templates.move_to_end(cache_key)
+                self.__template_hits += 1
+                return template
+            self.__template_misses += 1
+
+        def replace(match):
+            if match.group(1) is not None:
+                return match.group(1).replace('%', '%%')
+            if match.group(2) is not None:
+                return '%%(%s)s' % match.group(2) if match.group(2) in keys else match.group(0)
+            return '%%'
+
+        template = self.__placeholder_pattern.sub(replace, query)
+
+        with self.__templates_lock:
+            self.__templates[cache_key] = template
+            while len(self.__templates) > self.__template_cache_size:
+                self.__templates.popitem(False)
+
+        return template
+
+    def get_template_cache_stats(self):
+        """Returns query template cache statistics: hits, misses and size.
+
+        :rtype: dict
+        """
+        return {
+            'hits': self.__template_hits,
+            'misses': self.__template_misses,
+            'size': len(self.__templates),
+        }
+
+    def clear_template_cache(self):
+        """Removes all cached query templates and resets statistics.
+
+        :rtype: None
+        """
+        with self.__templates_lock:
+            self.__templates = collections.OrderedDict()
+            self.__template_hits = 0
+            self.__template_misses = 0
+
+    @staticmethod
+    def __build_order(order):
+        """Builds SQL "ORDER BY" part.
+
+        :param order: Order expression or list of expressions.
+        :type order: str|list|tuple|None
+        :rtype: str
+        """
+        if order is None:
+            return ''
+
+        if isinstance(order, (list, tuple)):
+            order = ', '.join(order)
+
+        return ' ORDER BY ' + order if len(order) else ''
+
+    @staticmethod
+    def __build_index_hint(hint, indexes):
+        """Builds SQL index hint part.
+
+        :param hint: Hint type (USE, FORCE).
+        :type hint: str
+        :param indexes: Index name or list of names.
+        :type indexes: str|list|tuple|None
+        :rtype: str
+        """
+        if indexes is None:
+            return ''
+
+        if isinstance(indexes, (list, tuple)):
+            indexes = ', '.join(indexes)
+
+        return ' %s INDEX (%s)' % (hint, indexes)
+
+    @staticmethod
+    def __build_read_where(where, resource, keys):
+        """Builds SQL where part.
+
+        :param where: Read where parameters.
+        :type where: str
+        :param resource: Resource name.
+        :type resource: str
+        :param keys: Names of fields compared for equality.
+        :type keys: list
+        :rtype: str
+        """
+        part = where if where is not None else ''
+
+        if len(part) and len(keys):
+            part += ' AND '
+
+        part += ' AND '.join(['%s.%s = :%s' % (resource, key, key) for key in keys])
+
+        return ' WHERE ' + part if len(part) else ''
 
 
 class MySQLAdapter(AAdapter):
     """PyAR MySQL adapter."""
 
-    def __init__(self, **kwargs):
-        """Constructor. Sets adapter config.
+    def __init__(self, schema_ttl=None, pool_min_size=1, pool_max_size=10, pool_recycle=3600, pool_ping=True,
+                 pool_ping_interval=30, pool_timeout=None, template_cache_size=512, **kwargs):
+        """Constructor. Sets adapter config and opens connection pool.
+        Connections are opened in autocommit mode unless autocommit is specified,
+        so statements outside of start_transaction() are committed immediately.
 
+        :param schema_ttl: Seconds after which cached table columns are reloaded. None means never expire.
+        :param pool_min_size: Number of connections opened on start.
+        :param pool_max_size: Maximum number of opened connections.
+        :param pool_recycle: Seconds after which an idle connection is closed instead of reused. None means never.
+        :param pool_ping: Shows whether connection is checked (and reconnected) when it's taken from the pool.
+        :param pool_ping_interval: Seconds a connection may stay idle before it's checked.
+        :param pool_timeout: Seconds to wait for a free connection. None means wait forever.
+        :param template_cache_size: Maximum number of cached query templates.
         :param host: Host where the database server is located
         :param user: Username to log in as
         :param passwd: Password to use.
@@ -50,38 +476,51 @@ class MySQLAdapter(AAdapter):
         :param compress; Not supported
         :param named_pipe: Not supported
         :param no_delay: Disable Nagle's algorithm on the socket
-        :param autocommit: Autocommit mode. None means use server default. (default: False)
+        :param autocommit: Autocommit mode. None means use server default. (default: True)
         :param db: Alias for database. (for compatibility to MySQLdb)
         """
-        self.__last_query = None
-        self.__last_result = None
+        self.__local = threading.local()
+        self.__schema_ttl = schema_ttl
+        self.__columns = dict()
+        self.__max_allowed_packet = None
+        self.__auto_increment_increment = None
+        self.__builder = MySQLQueryBuilder(template_cache_size)
+        kwargs.setdefault('autocommit', True)
         super().__init__(**kwargs)
-        self.__conn = pymysql.connect(**kwargs)
+        self.__pool = MySQLConnectionPool(min_size=pool_min_size, max_size=pool_max_size, recycle=pool_recycle,
+                                          ping=pool_ping, ping_interval=pool_ping_interval, timeout=pool_timeout,
+                                          **kwargs)
 
-    def execute(self, query, cursor_type=None):
+    def execute(self, query, cursor_type=None, args=None):
         """Executes query.
+        Connection stays bound to the current thread while a transaction is open
+        and is returned to the pool after the query otherwise.
 
         :param query: Query string.
         :type query: str
+        :param args: Query arguments, which are bound by the driver to the "%(key)s" placeholders.
+        :type args: dict
         :rtype: Cursor
         """
         cursor = self.get_connection().cursor(cursor_type)
-        self.__last_query = query
-        self.__last_result = cursor
+        self.__local.last_query = query
+        self.__local.last_args = args
+        self.__local.last_result = cursor
 
         try:
-            cursor.execute(query)
+            cursor.execute(query, args)
         except pymysql.IntegrityError as exc:
-            cursor.close()
             raise SQLAdapterExecuteException(exc.args)
-
-        cursor.close()
+        finally:
+            cursor.close()
+            if not self.in_transaction():
+                self.release_connection()
 
         return cursor
 
-
     def read(self, model_cls, select=None, joins=None, where=None, having=None, limit=None, offset=None, distinct=False,
-             group=None, order=None, params=dict(), query=None, **kwargs):
+             group=None, order=None, params=dict(), query=None, stream=False, chunk_size=1000, use_index=None,
+             force_index=None, raw=False, **kwargs):
         """Build SQL query and execute it.
 
         :param model_cls: PyAR model class.
@@ -105,146 +544,386 @@ class MySQLAdapter(AAdapter):
         :param group: Allows to specify grouping of result. Representing the "GROUP BY"-part of the SQL statement.
         :type group: str
         :param order: Allows to specify ordering of result. Representing the "ORDER BY"-part of the SQL statement.
-        :type order: str
+        List items are joined as multi-column ordering.
+        :type order: str|list
         :param params: Allows to specify query parameters.
         In other words it replaces every ":key" of builded query by value.
         :type params: dict
+        :param use_index: Index name or list of names the server should choose from. Adds "USE INDEX" hint.
+        :type use_index: str|list
+        :param force_index: Index name or list of names the server must use. Adds "FORCE INDEX" hint.
+        :type force_index: str|list
         :param query: Allows to specify full sql query.
         :type query: str
+        :param stream: Returns iterator which reads rows with unbuffered cursor instead of list.
+        :type stream: bool
+        :param chunk_size: Number of rows fetched at once while streaming.
+        :type chunk_size: int
+        :param raw: Returns rows as dicts (True or "dict") or tuples ("tuple") instead of models.
+        :type raw: bool|str
         :param kwargs: Allows to specify query conditions with AND statement.
         Representing the WHERE-part of the SQL statement.
         :type kwargs: dict
-        :rtype: list
+        :rtype: list|iterator
         """
         super().read(model_cls, **kwargs)
 
-        if query is None:
-            query = 'SELECT' \
-                    '%s' \
-                    '%s' \
-                    'FROM %s' \
-                    '%s' \
-                    '%s' \
-                    '%s' \
-                    '%s' \
-                    '%s' \
-                    '%s' % (
-                        ' DISTINCT' if distinct else '',
-                        ' %s ' % select if select is not None else ' %s.* ' % model_cls.get_resource(),
-                        model_cls.get_resource(),
-                        ' ' + joins if joins is not None else '',
-                        self.__build_read_where(where, model_cls.get_resource(), kwargs),
-                        ' GROUP BY ' + group if group is not None else '',
-                        ' HAVING ' + having if having is not None else '',
-                        ' LIMIT ' + str(limit) if limit is not None else '',
-                        ' OFFSET ' + str(offset) if offset is not None else '',
-                    )
-
-        params.update(kwargs)
-
-        if len(params):
-            params = pymysql.escape_dict(params, "'")
-            pattern = re.compile('|'.join([':' + key for key in params.keys()]))
-            query = pattern.sub(lambda x: params[x.group()[1:]], query)
-
-        cursor = self.execute(query, pymysql.cursors.DictCursor)
-        result = [model_cls(row, False) for row in cursor]
-
-        return result
+        query, params = self.__builder.prepare_read(model_cls, params=params, query=query, keys=kwargs, select=select,
+                                                    joins=joins, where=where, having=having, limit=limit,
+                                                    offset=offset, distinct=distinct, group=group, order=order,
+                                                    use_index=use_index, force_index=force_index)
 
-    @staticmethod
-    def __build_read_where(where, resource, kwargs):
-        """Builds SQL where part.
+        if stream:
+            return self.__stream(model_cls, query, params, chunk_size, raw)
 
-        :param where: Read where parameters.
-        :type where: str
-        :param resource: Resource name.
-        :type resource: str
-        :param kwargs: Read key word arguments.
-        :type kwargs: dict
+        return self.read_template(model_cls, query, params, raw)
+
+    def get_query_builder(self):
+        """Returns query builder.
+
+        :rtype: MySQLQueryBuilder
+        """
+        return self.__builder
+
+    def build_read_query(self, model_cls, **kwargs):
+        """Builds SQL query with ":key" placeholders. See MySQLQueryBuilder.build_read_query.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: IModel
         :rtype: str
         """
-        part = where if where is not None else ''
+        return self.__builder.build_read_query(model_cls, **kwargs)
 
-        if len(part) and len(kwargs):
-            part += ' AND '
+    def compile_read(self, model_cls, **kwargs):
+        """Builds SQL query and translates its placeholders. See MySQLQueryBuilder.compile_read.
 
-        part += ' AND '.join(['%s.%s = :%s' % (resource, key, key) for key in kwargs.keys()])
+        :param model_cls: PyAR model class.
+        :type model_cls: IModel
+        :rtype: tuple(str, frozenset)
+        """
+        return self.__builder.compile_read(model_cls, **kwargs)
 
-        return ' WHERE ' + part if len(part) else ''
+    def get_query_template(self, query, keys):
+        """Translates ":key" placeholders of the query into driver's placeholders.
+        See MySQLQueryBuilder.get_query_template.
+
+        :param query: Query string.
+        :type query: str
+        :param keys: Parameter keys.
+        :type keys: frozenset
+        :rtype: str
+        """
+        return self.__builder.get_query_template(query, keys)
+
+    def get_template_cache_stats(self):
+        """Returns query template cache statistics: hits, misses and size.
+
+        :rtype: dict
+        """
+        return self.__builder.get_template_cache_stats()
+
+    def clear_template_cache(self):
+        """Removes all cached query templates and resets statistics.
+
+        :rtype: None
+        """
+        self.__builder.clear_template_cache()
+
+    def read_template(self, model_cls, template, params=None, raw=False):
+        """Executes query template with driver's placeholders and returns list of models.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: IModel
+        :param template: Query template.
+        :type template: str
+        :param params: Query parameters.
+        :type params: dict
+        :param raw: Returns rows as dicts (True or "dict") or tuples ("tuple") instead of models.
+        :type raw: bool|str
+        :rtype: list
+        """
+        cursor = self.execute(template, self.__get_cursor_type(raw), params)
+
+        if raw:
+            return list(cursor)
+
+        models = [model_cls(row, False) for row in cursor]
+
+        for model in models:
+            model.mark_clean()
+
+        return models
+
+    def read_rows(self, query, params=None, cursor_type=None):
+        """Executes query with ":key" placeholders and returns rows as they are given by the cursor.
+        No models are built.
+
+        :param query: Query string.
+        :type query: str
+        :param params: Query parameters.
+        :type params: dict
+        :param cursor_type: Cursor class, which defines row type (tuple by default).
+        :type cursor_type: type
+        :rtype: list
+        """
+        if params:
+            query = self.get_query_template(query, frozenset(params.keys()))
+        else:
+            params = None
+
+        return list(self.execute(query, cursor_type or pymysql.cursors.Cursor, params))
+
+    def iter_read(self, model_cls, chunk_size=1000, **kwargs):
+        """Build SQL query and yields models of it's rows one by one.
+        Rows are read with unbuffered cursor, so memory usage doesn't depend on the number of rows.
+        Takes the same arguments as read.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: IModel
+        :param chunk_size: Number of rows fetched at once.
+        :type chunk_size: int
+        :rtype: iterator
+        """
+        return self.read(model_cls, stream=True, chunk_size=chunk_size, **kwargs)
+
+    @staticmethod
+    def __get_cursor_type(raw, stream=False):
+        """Returns cursor class for the given row type.
+
+        :param raw: False for models, True or "dict" for dicts, "tuple" for tuples.
+        :type raw: bool|str
+        :param stream: Returns unbuffered cursor class.
+        :type stream: bool
+        :rtype: type
+        """
+        if raw == 'tuple':
+            return pymysql.cursors.SSCursor if stream else pymysql.cursors.Cursor
+
+        if raw is False or raw is None or raw is True or raw == 'dict':
+            return pymysql.cursors.SSDictCursor if stream else pymysql.cursors.DictCursor
+
+        raise SQLAdapterExecuteException('Invalid raw row type [%s].' % raw)
+
+    def __stream(self, model_cls, query, params, chunk_size, raw=False):
+        """Executes query with unbuffered cursor and yields models chunk by chunk.
+        Query runs on its own connection taken from the pool, so the current thread can run
+        other queries while iterating. Changes of not committed transaction aren't visible.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: IModel
+        :param query: Query string.
+        :type query: str
+        :param params: Query arguments.
+        :type params: dict
+        :param chunk_size: Number of rows fetched at once.
+        :type chunk_size: int
+        :param raw: Yields rows as dicts (True or "dict") or tuples ("tuple") instead of models.
+        :type raw: bool|str
+        :rtype: iterator
+        """
+        cursor_type = self.__get_cursor_type(raw, True)
+        conn = self.get_pool().acquire()
+        cursor = conn.cursor(cursor_type)
+        self.__local.last_query = query
+        self.__local.last_args = params
+        self.__local.last_result = cursor
+        finished = False
+
+        try:
+            cursor.execute(query, params)
+
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not len(rows):
+                    break
+                if raw:
+                    yield from rows
+                else:
+                    for row in rows:
+                        model = model_cls(row, False)
+                        model.mark_clean()
+                        yield model
+
+            finished = True
+        finally:
+            if finished:
+                cursor.close()
+                self.get_pool().release(conn)
+            else:
+                # Closing unbuffered cursor would read all remaining rows, dropping connection is cheaper.
+                self.get_pool().discard(conn)
 
     def get_last_query(self):
-        """Returns last query.
+        """Returns last query of the current thread with bound arguments.
 
         :rtype: str
         """
-        return self.__last_query
+        query = getattr(self.__local, 'last_query', None)
+
+        if getattr(self.__local, 'last_args', None) is not None:
+            return getattr(self.get_last_result(), '_executed', query)
+
+        return query
 
     def get_last_result(self):
-        """Returns last result.
+        """Returns last result of the current thread.
 
         :rtype: Cursor
         """
-        return self.__last_result
+        return getattr(self.__local, 'last_result', None)
 
     def get_connection(self):
-        """Returns connection object.
+        """Returns connection bound to the current thread.
+        The connection stays bound until release_connection() is called or the transaction is finished.
 
         :rtype: Connection
         """
-        return self.__conn
+        return self.__pool.checkout()
+
+    def release_connection(self):
+        """Returns connection of the current thread to the pool.
+
+        :rtype: None
+        """
+        self.__pool.checkin()
+
+    def get_pool(self):
+        """Returns connection pool.
+
+        :rtype: MySQLConnectionPool
+        """
+        return self.__pool
+
+    def in_transaction(self):
+        """Returns whether the current thread has an open transaction.
+
+        :rtype: bool
+        """
+        return getattr(self.__local, 'in_transaction', False)
 
     def __del__(self):
-        """Destruct DB connection.
+        """Destruct DB connections.
 
         :rtype: None
         """
-        self.get_connection().close()
+        pool = getattr(self, '_MySQLAdapter__pool', None)
+
+        if pool is not None:
+            pool.close()
 
-    def __get_columns(self, model):
+    def get_columns(self, resource):
         """Returns table columns information.
+        Columns are loaded once per resource and cached until invalidated or expired.
 
-        :param model: PyAR sql model.
-        :type model: ASQLModel
+        :param resource: Resource (table) name.
+        :type resource: str
         :rtype: dict
         """
-        cursor = self.execute('SHOW COLUMNS FROM %s' % model.get_resource(), pymysql.cursors.DictCursor)
-        ret = dict((row['Field'], row) for row in cursor)
-        return ret
+        entry = self.__columns.get(resource)
 
-    def __get_model_data(self, model):
-        """Returns filtered model's data.
+        if entry is None or (self.__schema_ttl is not None and time.time() - entry[0] > self.__schema_ttl):
+            cursor = self.execute('SHOW COLUMNS FROM %s' % resource, pymysql.cursors.DictCursor)
+            entry = (time.time(), dict((row['Field'], row) for row in cursor))
+            self.__columns[resource] = entry
+
+        return entry[1]
+
+    def get_column_types(self, resource):
+        """Returns column name ~> column type pairs of the resource.
+
+        :param resource: Resource (table) name.
+        :type resource: str
+        :rtype: dict
+        """
+        return dict((key, value['Type']) for key, value in self.get_columns(resource).items())
+
+    def invalidate_columns(self, resource=None):
+        """Removes cached columns information of the resource or of all resources if resource is not specified.
+
+        :param resource: Resource (table) name.
+        :type resource: str
+        :rtype: None
+        """
+        if resource is None:
+            self.__columns = dict()
+        else:
+            self.__columns.pop(resource, None)
+
+    def get_max_allowed_packet(self):
+        """Returns server's max_allowed_packet value. It's loaded once.
+
+        :rtype: int
+        """
+        if self.__max_allowed_packet is None:
+            cursor = self.execute('SELECT @@max_allowed_packet AS max_allowed_packet', pymysql.cursors.DictCursor)
+            self.__max_allowed_packet = int(cursor.fetchone()['max_allowed_packet'])
+
+        return self.__max_allowed_packet
+
+    def get_auto_increment_increment(self):
+        """Returns server's auto_increment_increment value. It's loaded once.
+
+        :rtype: int
+        """
+        if self.__auto_increment_increment is None:
+            cursor = self.execute('SELECT @@auto_increment_increment AS auto_increment_increment',
+                                  pymysql.cursors.DictCursor)
+            self.__auto_increment_increment = int(cursor.fetchone()['auto_increment_increment'])
+
+        return self.__auto_increment_increment
+
+    def __get_model_data(self, model, dirty=False):
+        """Returns filtered and escaped model's data.
 
         :param model: PyAR sql model.
         :type model: ASQLModel
+        :param dirty: Returns only fields changed since the model was loaded or saved.
+        :type dirty: bool
         :rtype: dict
         """
-        columns = self.__get_columns(model)
-        return dict((key, value) for key, value in pymysql.escape_dict(model.get_data(False), "'").items()
-                    if key in columns)
+        columns = self.get_columns(model.get_resource())
+        data = model.get_dirty_data() if dirty else model.get_data(False)
+        return pymysql.escape_dict(dict((key, value) for key, value in data.items() if key in columns), "'")
 
     def start_transaction(self):
         """Execute "START TRANSACTION" query.
 
         :rtype: None
         """
-        self.execute('START TRANSACTION')
+        self.__local.in_transaction = True
+
+        try:
+            self.execute('START TRANSACTION')
+        except Exception:
+            self.__local.in_transaction = False
+            self.release_connection()
+            raise
 
     def commit_transaction(self):
         """Execute "COMMIT" query.
 
         :rtype: None
         """
-        self.get_connection().commit()
-        self.__last_query = 'COMMIT'
+        try:
+            self.get_connection().commit()
+        finally:
+            self.__local.in_transaction = False
+            self.release_connection()
+        self.__local.last_query = 'COMMIT'
+        self.__local.last_args = None
 
     def rollback_transaction(self):
         """Execute "ROLLBACK" query.
 
         :rtype: None
         """
-        self.get_connection().rollback()
-        self.__last_query = 'ROLLBACK'
+        try:
+            self.get_connection().rollback()
+        finally:
+            self.__local.in_transaction = False
+            self.release_connection()
+        self.__local.last_query = 'ROLLBACK'
+        self.__local.last_args = None
 
     def create(self, model):
         """Create model.
@@ -260,17 +939,12 @@ class MySQLAdapter(AAdapter):
         if not len(data):
             raise SQLAdapterExecuteException('Nothing to insert.')
 
-        query = 'INSERT INTO %s (%s) VALUES (%s)' % (
-            model.get_resource(),
-            ','.join(data.keys()),
-            ','.join(data.values()),
-        )
-
-        cursor = self.execute(query)
+        cursor = self.execute(self.__builder.build_insert(model.get_resource(), data))
         return True
 
     def update(self, model):
-        """Update model.
+        """Update changed columns of the model.
+        Returns False without querying the database if no column was changed.
 
         :param model: PyAR model.
         :type ASQLModel
@@ -278,19 +952,12 @@ class MySQLAdapter(AAdapter):
         """
         super().update(model)
 
-        data = self.__get_model_data(model)
+        data = self.__get_model_data(model, True)
 
         if not len(data):
-            raise SQLAdapterExecuteException('Nothing to update.')
-
-        query = 'UPDATE %s SET %s WHERE %s = %s' % (
-            model.get_resource(),
-            ', '.join(['%s = %s' % (key, value) for key, value in data.items()]),
-            model.get_pk(),
-            pymysql.escape_string(str(model.get_id())),
-        )
+            return False
 
-        cursor = self.execute(query)
+        cursor = self.execute(self.__builder.build_update(model.get_resource(), data, model.get_pk(), model.get_id()))
         return True
 
     def delete(self, model):
@@ -302,11 +969,214 @@ class MySQLAdapter(AAdapter):
         """
         super().delete(model)
 
-        query = 'DELETE FROM %s WHERE %s = %s LIMIT 1' % (
-            model.get_resource(),
-            model.get_pk(),
-            pymysql.escape_string(str(model.get_id())),
-        )
+        cursor = self.execute(self.__builder.build_delete(model.get_resource(), model.get_pk(), model.get_id()))
+        return True
+
+    def bulk_create(self, model_cls, models, batch_size=1000):
+        """Inserts models with multi-row INSERT statements.
+        Models are grouped by their column set and every statement is kept below max_allowed_packet.
+        Primary keys of models without one are filled from lastrowid stepped by auto_increment_increment,
+        which assumes that a multi-row insert gets its auto increment values in one run
+        (innodb_autoinc_lock_mode 0 or 1).
+
+        :param model_cls: PyAR model class.
+        :type model_cls: ASQLModel
+        :param models: Models to insert.
+        :type models: list<ASQLModel>
+        :param batch_size: Maximum number of rows per statement.
+        :type batch_size: int
+        :rtype: bool
+        """
+        return self.__insert_many(model_cls, models, batch_size)
+
+    def bulk_upsert(self, model_cls, models, fields=None, batch_size=1000):
+        """Inserts models or updates existing rows with multi-row INSERT ... ON DUPLICATE KEY UPDATE statements.
+        Primary keys of inserted rows are not filled.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: ASQLModel
+        :param models: Models to insert or update.
+        :type models: list<ASQLModel>
+        :param fields: Columns to update on duplicate key. All inserted columns except primary key by default.
+        :type fields: list
+        :param batch_size: Maximum number of rows per statement.
+        :type batch_size: int
+        :rtype: bool
+        """
+        return self.__insert_many(model_cls, models, batch_size, upsert=True, update_fields=fields)
+
+    def bulk_update(self, model_cls, models, fields=None, batch_size=1000):
+        """Updates models with batched "UPDATE ... SET field = CASE pk WHEN ... END" statements.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: ASQLModel
+        :param models: Models to update.
+        :type models: list<ASQLModel>
+        :param fields: Columns to update. Changed columns of every model by default.
+        :type fields: list
+        :param batch_size: Maximum number of rows per statement.
+        :type batch_size: int
+        :rtype: bool
+        """
+        pk = model_cls.get_pk()
+        rows = []
+
+        for model in models:
+            super().update(model)
+
+            if model.get_id() is None:
+                raise SQLAdapterExecuteException('Model without primary key can not be updated.')
+
+            data = self.__get_model_data(model, fields is None)
+
+            if len(data):
+                rows.append((escape_item(model.get_id(), 'utf8'), data))
+
+        if not len(rows):
+            return True
+
+        if fields is None:
+            fields = sorted(set([key for id, data in rows for key in data.keys()]))
+
+        fields = [key for key in fields if key != pk]
+
+        if not len(fields):
+            raise SQLAdapterExecuteException('Nothing to update.')
+
+        max_size = self.get_max_allowed_packet() - 1024
+        base_size = len('UPDATE %s SET  WHERE %s IN ()' % (model_cls.get_resource(), pk)) \
+            + sum([len('%s = CASE %s  ELSE %s END, ' % (key, pk, key)) for key in fields])
+        batch = []
+        size = base_size
+
+        for id, data in rows:
+            row_size = len(id.encode()) + 1 \
+                + sum([len(('WHEN %s THEN %s ' % (id, data[key])).encode()) for key in fields if key in data])
+
+            if len(batch) and (len(batch) >= batch_size or size + row_size > max_size):
+                self.__update_batch(model_cls, fields, batch)
+                batch = []
+                size = base_size
+
+            batch.append((id, data))
+            size += row_size
+
+        if len(batch):
+            self.__update_batch(model_cls, fields, batch)
 
-        cursor = self.execute(query)
         return True
+
+    def __update_batch(self, model_cls, fields, batch):
+        """Executes one "UPDATE ... SET field = CASE pk WHEN ... END" statement.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: ASQLModel
+        :param fields: Updated columns.
+        :type fields: list
+        :param batch: List of (escaped primary key, escaped data) pairs.
+        :type batch: list
+        :rtype: None
+        """
+        pk = model_cls.get_pk()
+        parts = []
+
+        for key in fields:
+            cases = ' '.join(['WHEN %s THEN %s' % (id, data[key]) for id, data in batch if key in data])
+            if len(cases):
+                parts.append('%s = CASE %s %s ELSE %s END' % (key, pk, cases, key))
+
+        if len(parts):
+            self.execute('UPDATE %s SET %s WHERE %s IN (%s)' % (
+                model_cls.get_resource(),
+                ', '.join(parts),
+                pk,
+                ','.join([id for id, data in batch]),
+            ))
+
+    def __insert_many(self, model_cls, models, batch_size, upsert=False, update_fields=None):
+        """Inserts models with multi-row INSERT statements.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: ASQLModel
+        :param models: Models to insert.
+        :type models: list<ASQLModel>
+        :param batch_size: Maximum number of rows per statement.
+        :type batch_size: int
+        :param upsert: Adds "ON DUPLICATE KEY UPDATE" part to the statements.
+        :type upsert: bool
+        :param update_fields: Columns to update on duplicate key.
+        :type update_fields: list
+        :rtype: bool
+        """
+        groups = dict()
+
+        for model in models:
+            super().create(model)
+            data = self.__get_model_data(model)
+
+            if not len(data):
+                raise SQLAdapterExecuteException('Nothing to insert.')
+
+            groups.setdefault(tuple(sorted(data.keys())), []).append((model, data))
+
+        max_size = self.get_max_allowed_packet() - 1024
+
+        for columns, items in groups.items():
+            prefix = 'INSERT INTO %s (%s) VALUES ' % (model_cls.get_resource(), ','.join(columns))
+            suffix = ''
+
+            if upsert:
+                fields = [key for key in (columns if update_fields is None else update_fields)
+                          if key in columns and key != model_cls.get_pk()]
+                if not len(fields):
+                    fields = [model_cls.get_pk()]
+                suffix = ' ON DUPLICATE KEY UPDATE ' + ', '.join(['%s = VALUES(%s)' % (key, key) for key in fields])
+
+            batch = []
+            size = len(prefix) + len(suffix)
+
+            for model, data in items:
+                row = '(%s)' % ','.join([data[key] for key in columns])
+                row_size = len(row.encode()) + 1
+
+                if len(batch) and (len(batch) >= batch_size or size + row_size > max_size):
+                    self.__insert_batch(model_cls, prefix, suffix, columns, batch, not upsert)
+                    batch = []
+                    size = len(prefix) + len(suffix)
+
+                batch.append((model, row))
+                size += row_size
+
+            if len(batch):
+                self.__insert_batch(model_cls, prefix, suffix, columns, batch, not upsert)
+
+        return True
+
+    def __insert_batch(self, model_cls, prefix, suffix, columns, batch, fill_pk):
+        """Executes one multi-row INSERT statement and marks inserted models as not new.
+        Models inserted without primary key which isn't filled stay new, since they can't be updated by it.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: ASQLModel
+        :param prefix: "INSERT INTO ... VALUES " part of the statement.
+        :type prefix: str
+        :param suffix: "ON DUPLICATE KEY UPDATE ..." part of the statement.
+        :type suffix: str
+        :param columns: Inserted columns.
+        :type columns: tuple
+        :param batch: List of (model, row values) pairs.
+        :type batch: list
+        :param fill_pk: Fill primary keys from lastrowid flag.
+        :type fill_pk: bool
+        :rtype: None
+        """
+        pk = model_cls.get_pk()
+        increment = self.get_auto_increment_increment() if fill_pk and pk not in columns else 1
+        cursor = self.execute(prefix + ','.join([row for model, row in batch]) + suffix)
+
+        for i, (model, row) in enumerate(batch):
+            if pk not in columns:
+                if not fill_pk:
+                    continue
+                setattr(model, pk, cursor.lastrowid + i * increment)
+            model.set_is_new(False)
@@ -0,0 +1,196 @@
+"""
+    PyAR response cache package.
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :license:
+        This code is a part of Communication Interface for Import/Export,
+        which is a proprietary subject of its rightful owners. Any form of
+        copy or distribution is forbidden without written permission.
+
+    :copyright:
+        Copyright (c) 2014 symmetrics - a CGI Group brand
+
+    :author:
+        symmetrics - a CGI Group brand <info@symmetrics.de>
+        Oleg Bronzov <oleg.bronzov@symmetrics.de>
+"""
+
+import collections
+import sqlite3
+import threading
+
+
+CacheEntry = collections.namedtuple('CacheEntry', ['body', 'etag', 'last_modified', 'expires'])
+"Cached response: body text, validators and expiration timestamp."
+
+
+class IResponseCache(object):
+    """Response cache interface. Entries are keyed by url."""
+
+    def get(self, url):
+        """Returns cached entry or None. Expired entries are returned too, so they can be revalidated.
+
+        :param url: Request url.
+        :type url: str
+        :rtype: CacheEntry|None
+        """
+        pass
+
+    def set(self, url, entry):
+        """Stores entry.
+
+        :param url: Request url.
+        :type url: str
+        :param entry: Cached response.
+        :type entry: CacheEntry
+        :rtype: None
+        """
+        pass
+
+    def remove(self, url):
+        """Removes entry.
+
+        :param url: Request url.
+        :type url: str
+        :rtype: None
+        """
+        pass
+
+    def clear(self):
+        """Removes all entries.
+
+        :rtype: None
+        """
+        pass
+
+
+class MemoryResponseCache(IResponseCache):
+    """In-memory cache which drops least recently used entries."""
+
+    def __init__(self, size=1024):
+        """Constructor.
+
+        :param size: Maximum number of entries.
+        :type size: int
+        """
+        self.__size = size
+        self.__entries = collections.OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, url):
+        """Returns cached entry or None.
+
+        :param url: Request url.
+        :type url: str
+        :rtype: CacheEntry|None
+        """
+        with self.__lock:
+            entry = self.__entries.get(url)
+            if entry is not None:
+                self.__entries.move_to_end(url)
+            return entry
+
+    def set(self, url, entry):
+        """Stores entry.
+
+        :param url: Request url.
+        :type url: str
+        :param entry: Cached response.
+        :type entry: CacheEntry
+        :rtype: None
+        """
+        with self.__lock:
+            self.__entries[url] = entry
+            self.__entries.move_to_end(url)
+            while len(self.__entries) > self.__size:
+                self.__entries.popitem(False)
+
+    def remove(self, url):
+        """Removes entry.
+
+        :param url: Request url.
+        :type url: str
+        :rtype: None
+        """
+        with self.__lock:
+            self.__entries.pop(url, None)
+
+    def clear(self):
+        """Removes all entries.
+
+        :rtype: None
+        """
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self):
+        """Returns number of entries.
+
+        :rtype: int
+        """
+        return len(self.__entries)
+
+
+class SQLiteResponseCache(IResponseCache):
+    """On-disk cache stored in sqlite database, so entries survive restarts and are shared by processes."""
+
+    def __init__(self, path):
+        """Constructor. Creates cache table if it doesn't exist.
+
+        :param path: Database file path.
+        :type path: str
+        """
+        self.__lock = threading.Lock()
+        self.__conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.__conn.execute('CREATE TABLE IF NOT EXISTS pyar_response_cache ('
+                            'url TEXT PRIMARY KEY, body TEXT, etag TEXT, last_modified TEXT, expires REAL)')
+
+    def get(self, url):
+        """Returns cached entry or None.
+
+        :param url: Request url.
+        :type url: str
+        :rtype: CacheEntry|None
+        """
+        with self.__lock:
+            row = self.__conn.execute('SELECT body, etag, last_modified, expires FROM pyar_response_cache '
+                                      'WHERE url = ?', (url,)).fetchone()
+        return CacheEntry(*row) if row is not None else None
+
+    def set(self, url, entry):
+        """Stores entry.
+
+        :param url: Request url.
+        :type url: str
+        :param entry: Cached response.
+        :type entry: CacheEntry
+        :rtype: None
+        """
+        with self.__lock:
+            self.__conn.execute('REPLACE INTO pyar_response_cache (url, body, etag, last_modified, expires) '
+                                'VALUES (?, ?, ?, ?, ?)', (url,) + tuple(entry))
+
+    def remove(self, url):
+        """Removes entry.
+
+        :param url: Request url.
+        :type url: str
+        :rtype: None
+        """
+        with self.__lock:
+            self.__conn.execute('DELETE FROM pyar_response_cache WHERE url = ?', (url,))
+
+    def clear(self):
+        """Removes all entries.
+
+        :rtype: None
+        """
+        with self.__lock:
+            self.__conn.execute('DELETE FROM pyar_response_cache')
+
+    def close(self):
+        """Closes database connection.
+
+        :rtype: None
+        """
+        self.__conn.close()
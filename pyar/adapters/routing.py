@@ -0,0 +1,445 @@
+"""
+    PyAR routing adapter package.
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :license:
+        This code is a part of Communication Interface for Import/Export,
+        which is a proprietary subject of its rightful owners. Any form of
+        copy or distribution is forbidden without written permission.
+
+    :copyright:
+        Copyright (c) 2014 symmetrics - a CGI Group brand
+
+    :author:
+        symmetrics - a CGI Group brand <info@symmetrics.de>
+        Oleg Bronzov <oleg.bronzov@symmetrics.de>
+"""
+
+from ..adapter import AAdapter
+from ..exception import AdapterConfigKeyException
+
+import contextlib
+import threading
+import time
+
+import pymysql
+
+
+class RoutingAdapter(AAdapter):
+    """Splits reads and writes between primary MySQLAdapter and its replicas:
+
+        PyAR.add_adapter(RoutingAdapter(MySQLAdapter(host='db1'), [MySQLAdapter(host='db2'), MySQLAdapter(host='db3')]))
+
+    Writes and transactions go to the primary. Reads are spread over healthy replicas. Replica which fails
+    with connection error is marked down and tried again after retry_interval seconds, the read is repeated
+    on another replica or on the primary. After a write, reads of the same thread stick to the primary
+    for sticky_time seconds or till the end of unit_of_work() block, so they see their own writes.
+    """
+
+    ROUND_ROBIN = 'round_robin'
+    "Replicas are used one after another."
+
+    LEAST_LATENCY = 'least_latency'
+    "Replica with the lowest average read time is used."
+
+    __connection_errors = (2002, 2003, 2006, 2013)
+    "MySQL client error codes of lost or refused connections, which mark replica down."
+
+    def __init__(self, primary, replicas=(), strategy=ROUND_ROBIN, retry_interval=30, sticky_time=5,
+                 latency_decay=0.2):
+        """Constructor.
+
+        :param primary: Adapter which serves writes, transactions and reads if no replica is available.
+        :type primary: MySQLAdapter
+        :param replicas: Adapters which serve reads.
+        :type replicas: list<MySQLAdapter>
+        :param strategy: Replica choice strategy (round_robin, least_latency).
+        :type strategy: str
+        :param retry_interval: Seconds after which replica marked down is tried again.
+        :type retry_interval: int
+        :param sticky_time: Seconds while reads of the thread stick to the primary after a write.
+        None means till the end of unit_of_work() block.
+        :type sticky_time: int
+        :param latency_decay: Weight of the last read time in the average read time of replica.
+        :type latency_decay: float
+        """
+        if strategy not in (self.ROUND_ROBIN, self.LEAST_LATENCY):
+            raise AdapterConfigKeyException('Invalid routing strategy [%s].' % strategy)
+
+        self.__primary = primary
+        self.__replicas = list(replicas)
+        self.__strategy = strategy
+        self.__retry_interval = retry_interval
+        self.__sticky_time = sticky_time
+        self.__latency_decay = latency_decay
+        self.__down_until = dict()
+        self.__latency = dict()
+        self.__next = 0
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        super().__init__()
+
+    def get_primary(self):
+        """Returns primary adapter.
+
+        :rtype: MySQLAdapter
+        """
+        return self.__primary
+
+    def get_replicas(self):
+        """Returns replica adapters.
+
+        :rtype: list<MySQLAdapter>
+        """
+        return list(self.__replicas)
+
+    def is_up(self, replica):
+        """Returns whether replica is used for reads.
+
+        :param replica: Replica adapter.
+        :type replica: MySQLAdapter
+        :rtype: bool
+        """
+        with self.__lock:
+            return self.__down_until.get(id(replica), 0) <= time.time()
+
+    def mark_down(self, replica):
+        """Excludes replica from reads for retry_interval seconds.
+
+        :param replica: Replica adapter.
+        :type replica: MySQLAdapter
+        :rtype: None
+        """
+        with self.__lock:
+            self.__down_until[id(replica)] = time.time() + self.__retry_interval
+
+    def mark_up(self, replica):
+        """Returns replica to reads.
+
+        :param replica: Replica adapter.
+        :type replica: MySQLAdapter
+        :rtype: None
+        """
+        with self.__lock:
+            self.__down_until.pop(id(replica), None)
+
+    def get_replica_stats(self):
+        """Returns state of replicas in the order of replicas: up flag and average read time in seconds.
+
+        :rtype: list<dict>
+        """
+        with self.__lock:
+            now = time.time()
+            return [{'up': self.__down_until.get(id(replica), 0) <= now, 'latency': self.__latency.get(id(replica))}
+                    for replica in self.__replicas]
+
+    def stick_to_primary(self):
+        """Makes reads of the current thread go to the primary, as after a write.
+
+        :rtype: None
+        """
+        self.__local.sticky_until = float('inf') if self.__sticky_time is None else time.time() + self.__sticky_time
+
+    def reset_sticky(self):
+        """Allows reads of the current thread to go to replicas again.
+
+        :rtype: None
+        """
+        self.__local.sticky_until = 0
+
+    @contextlib.contextmanager
+    def unit_of_work(self):
+        """Context manager. Reads stick to the primary after a write only till the end of the block.
+
+        :rtype: None
+        """
+        self.reset_sticky()
+
+        try:
+            yield self
+        finally:
+            self.reset_sticky()
+
+    def __is_sticky(self):
+        """Returns whether reads of the current thread go to the primary.
+
+        :rtype: bool
+        """
+        return getattr(self.__local, 'sticky_until', 0) > time.time() or self.__primary.in_transaction()
+
+    def __get_read_candidates(self):
+        """Returns adapters which may serve the read in preferred order. The primary is the last one.
+
+        :rtype: list
+        """
+        if self.__is_sticky() or not len(self.__replicas):
+            return [self.__primary]
+
+        with self.__lock:
+            now = time.time()
+            up = [replica for replica in self.__replicas if self.__down_until.get(id(replica), 0) <= now]
+
+            if self.__strategy == self.LEAST_LATENCY:
+                up.sort(key=lambda replica: self.__latency.get(id(replica), 0))
+            elif len(up):
+                start = self.__next % len(up)
+                self.__next += 1
+                up = up[start:] + up[:start]
+
+        return up + [self.__primary]
+
+    def __record_latency(self, replica, seconds):
+        """Updates average read time of the replica.
+
+        :param replica: Replica adapter.
+        :type replica: MySQLAdapter
+        :param seconds: Read time.
+        :type seconds: float
+        :rtype: None
+        """
+        with self.__lock:
+            average = self.__latency.get(id(replica))
+            self.__latency[id(replica)] = seconds if average is None \
+                else average + self.__latency_decay * (seconds - average)
+
+    def __is_connection_error(self, exc):
+        """Returns whether the error means the replica is unreachable, not that the query failed.
+
+        :param exc: Raised error.
+        :type exc: Exception
+        :rtype: bool
+        """
+        if isinstance(exc, pymysql.InterfaceError):
+            return True
+
+        return isinstance(exc, pymysql.OperationalError) and len(exc.args) > 0 \
+            and exc.args[0] in self.__connection_errors
+
+    def __route_read(self, method, *args, **kwargs):
+        """Calls read method of the first healthy candidate.
+
+        :param method: Adapter method name.
+        :type method: str
+        :rtype: mixed
+        """
+        candidates = self.__get_read_candidates()
+
+        for adapter in candidates:
+            self.__local.last_adapter = adapter
+
+            if adapter is self.__primary:
+                return getattr(adapter, method)(*args, **kwargs)
+
+            start = time.time()
+
+            try:
+                result = getattr(adapter, method)(*args, **kwargs)
+            except Exception as exc:
+                if not self.__is_connection_error(exc):
+                    raise
+                self.mark_down(adapter)
+                continue
+
+            self.__record_latency(adapter, time.time() - start)
+            return result
+
+    def __route_stream(self, method, *args, **kwargs):
+        """Yields rows of read method of the first healthy candidate.
+        Streamed queries run on the first fetch, so the replica fails over and its latency is measured there.
+        Errors raised after the first row are not failed over, since the rows are already yielded.
+
+        :param method: Adapter method name.
+        :type method: str
+        :rtype: iterator
+        """
+        candidates = self.__get_read_candidates()
+
+        for adapter in candidates:
+            self.__local.last_adapter = adapter
+
+            if adapter is self.__primary:
+                yield from getattr(adapter, method)(*args, **kwargs)
+                return
+
+            start = time.time()
+            rows = iter(getattr(adapter, method)(*args, **kwargs))
+
+            try:
+                first = next(rows)
+            except StopIteration:
+                self.__record_latency(adapter, time.time() - start)
+                return
+            except Exception as exc:
+                if not self.__is_connection_error(exc):
+                    raise
+                self.mark_down(adapter)
+                continue
+
+            self.__record_latency(adapter, time.time() - start)
+            yield first
+            yield from rows
+
+    def __route_write(self, method, *args, **kwargs):
+        """Calls write method of the primary and sticks reads of the current thread to it.
+
+        :param method: Adapter method name.
+        :type method: str
+        :rtype: mixed
+        """
+        self.__local.last_adapter = self.__primary
+        self.stick_to_primary()
+        return getattr(self.__primary, method)(*args, **kwargs)
+
+    def read(self, model_cls, **kwargs):
+        """Reads from replica or primary. See MySQLAdapter.read.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: IModel
+        :rtype: list|iterator
+        """
+        if kwargs.get('stream'):
+            return self.__route_stream('read', model_cls, **kwargs)
+
+        return self.__route_read('read', model_cls, **kwargs)
+
+    def iter_read(self, model_cls, **kwargs):
+        """Reads rows one by one from replica or primary. See MySQLAdapter.iter_read.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: IModel
+        :rtype: iterator
+        """
+        return self.__route_stream('iter_read', model_cls, **kwargs)
+
+    def read_template(self, model_cls, template, params=None, raw=False):
+        """Executes query template on replica or primary. See MySQLAdapter.read_template.
+
+        :rtype: list
+        """
+        return self.__route_read('read_template', model_cls, template, params, raw)
+
+    def read_rows(self, query, params=None, cursor_type=None):
+        """Executes query on replica or primary and returns plain rows. See MySQLAdapter.read_rows.
+
+        :rtype: list
+        """
+        return self.__route_read('read_rows', query, params, cursor_type)
+
+    def build_read_query(self, model_cls, **kwargs):
+        """Builds SQL query. See MySQLAdapter.build_read_query.
+
+        :rtype: str
+        """
+        return self.__primary.build_read_query(model_cls, **kwargs)
+
+    def compile_read(self, model_cls, **kwargs):
+        """Builds SQL query and translates its placeholders. See MySQLAdapter.compile_read.
+
+        :rtype: tuple(str, frozenset)
+        """
+        return self.__primary.compile_read(model_cls, **kwargs)
+
+    def get_query_template(self, query, keys):
+        """Translates ":key" placeholders of the query. See MySQLAdapter.get_query_template.
+
+        :rtype: str
+        """
+        return self.__primary.get_query_template(query, keys)
+
+    def create(self, model, **kwargs):
+        """Creates model on the primary.
+
+        :rtype: bool
+        """
+        return self.__route_write('create', model, **kwargs)
+
+    def update(self, model, **kwargs):
+        """Updates model on the primary.
+
+        :rtype: bool
+        """
+        return self.__route_write('update', model, **kwargs)
+
+    def delete(self, model, **kwargs):
+        """Deletes model on the primary.
+
+        :rtype: bool
+        """
+        return self.__route_write('delete', model, **kwargs)
+
+    def bulk_create(self, model_cls, models, batch_size=1000):
+        """Creates models on the primary. See MySQLAdapter.bulk_create.
+
+        :rtype: bool
+        """
+        return self.__route_write('bulk_create', model_cls, models, batch_size)
+
+    def bulk_upsert(self, model_cls, models, fields=None, batch_size=1000):
+        """Upserts models on the primary. See MySQLAdapter.bulk_upsert.
+
+        :rtype: bool
+        """
+        return self.__route_write('bulk_upsert', model_cls, models, fields, batch_size)
+
+    def bulk_update(self, model_cls, models, fields=None, batch_size=1000):
+        """Updates models on the primary. See MySQLAdapter.bulk_update.
+
+        :rtype: bool
+        """
+        return self.__route_write('bulk_update', model_cls, models, fields, batch_size)
+
+    def execute(self, query, cursor_type=None, args=None):
+        """Executes query on the primary, since it may write.
+
+        :rtype: Cursor
+        """
+        return self.__route_write('execute', query, cursor_type, args)
+
+    def start_transaction(self):
+        """Starts transaction on the primary.
+
+        :rtype: None
+        """
+        return self.__route_write('start_transaction')
+
+    def commit_transaction(self):
+        """Commits transaction of the primary.
+
+        :rtype: None
+        """
+        return self.__route_write('commit_transaction')
+
+    def rollback_transaction(self):
+        """Rolls back transaction of the primary.
+
+        :rtype: None
+        """
+        return self.__route_write('rollback_transaction')
+
+    def in_transaction(self):
+        """Returns whether the current thread has open transaction on the primary.
+
+        :rtype: bool
+        """
+        return self.__primary.in_transaction()
+
+    def get_columns(self, resource):
+        """Returns table columns information of the primary.
+
+        :rtype: dict
+        """
+        return self.__primary.get_columns(resource)
+
+    def get_last_query(self):
+        """Returns last query of the adapter which served the last call of the current thread.
+
+        :rtype: str
+        """
+        return getattr(self.__local, 'last_adapter', self.__primary).get_last_query()
+
+    def get_last_result(self):
+        """Returns last result of the adapter which served the last call of the current thread.
+
+        :rtype: Cursor
+        """
+        return getattr(self.__local, 'last_adapter', self.__primary).get_last_result()
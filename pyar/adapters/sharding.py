@@ -0,0 +1,635 @@
+"""
+    PyAR sharding adapter package.
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :license:
+        This code is a part of Communication Interface for Import/Export,
+        which is a proprietary subject of its rightful owners. Any form of
+        copy or distribution is forbidden without written permission.
+
+    :copyright:
+        Copyright (c) 2014 symmetrics - a CGI Group brand
+
+    :author:
+        symmetrics - a CGI Group brand <info@symmetrics.de>
+        Oleg Bronzov <oleg.bronzov@symmetrics.de>
+"""
+
+from ..adapter import AAdapter
+from ..exception import AdapterConfigKeyException, SQLAdapterExecuteException
+
+from concurrent.futures import ThreadPoolExecutor
+import bisect
+import collections.abc
+import heapq
+import itertools
+import re
+import threading
+import zlib
+
+
+class IShardStrategy(object):
+    """Shard strategy interface. Maps shard key value to shard number."""
+
+    def get_shard(self, key, count):
+        """Returns shard number of the key or None if the key isn't mapped to any shard.
+
+        :param key: Shard key value.
+        :type key: mixed
+        :param count: Number of shards.
+        :type count: int
+        :rtype: int|None
+        """
+        pass
+
+
+class HashShardStrategy(IShardStrategy):
+    """Spreads keys evenly over shards by CRC32 of their string value.
+    The hash doesn't depend on the process, so every process maps a key to the same shard.
+    """
+
+    def get_shard(self, key, count):
+        """Returns shard number of the key.
+
+        :param key: Shard key value.
+        :type key: mixed
+        :param count: Number of shards.
+        :type count: int
+        :rtype: int
+        """
+        return zlib.crc32(str(key).encode('utf-8')) % count
+
+
+class RangeShardStrategy(IShardStrategy):
+    """Maps keys to shards by ranges. Shard n holds keys lower than bounds[n] and not lower than bounds[n - 1],
+    the last shard holds keys not lower than the last bound:
+
+        RangeShardStrategy([1000000, 2000000])  # 3 shards
+    """
+
+    def __init__(self, bounds):
+        """Constructor.
+
+        :param bounds: Sorted upper bounds (exclusive) of all shards except the last one.
+        :type bounds: list
+        """
+        if list(bounds) != sorted(bounds):
+            raise AdapterConfigKeyException('Shard range bounds must be sorted.')
+
+        self.__bounds = list(bounds)
+
+    def get_shard(self, key, count):
+        """Returns shard number of the key.
+
+        :param key: Shard key value.
+        :type key: mixed
+        :param count: Number of shards.
+        :type count: int
+        :rtype: int
+        """
+        return bisect.bisect_right(self.__bounds, key)
+
+
+class DirectoryShardStrategy(IShardStrategy):
+    """Maps keys to shards by lookup table, so single keys can be placed and moved explicitly."""
+
+    def __init__(self, directory=None, default=None):
+        """Constructor.
+
+        :param directory: Shard numbers by key.
+        :type directory: dict
+        :param default: Shard number of keys which aren't in the directory. None means such keys aren't mapped.
+        :type default: int
+        """
+        self.__directory = dict(directory or {})
+        self.__default = default
+
+    def assign(self, key, shard):
+        """Maps key to the shard.
+
+        :param key: Shard key value.
+        :type key: mixed
+        :param shard: Shard number.
+        :type shard: int
+        :rtype: None
+        """
+        self.__directory[key] = shard
+
+    def remove(self, key):
+        """Removes key from the directory.
+
+        :param key: Shard key value.
+        :type key: mixed
+        :rtype: None
+        """
+        self.__directory.pop(key, None)
+
+    def get_shard(self, key, count):
+        """Returns shard number of the key or default one.
+
+        :param key: Shard key value.
+        :type key: mixed
+        :param count: Number of shards.
+        :type count: int
+        :rtype: int|None
+        """
+        return self.__directory.get(key, self.__default)
+
+
+class _MergeKey(object):
+    """Sort key of merged rows with ascending and descending columns."""
+
+    __slots__ = ('values', 'descending')
+
+    def __init__(self, values, descending):
+        """Constructor.
+
+        :param values: Column values.
+        :type values: list
+        :param descending: Descending flags of columns.
+        :type descending: list<bool>
+        """
+        self.values = values
+        self.descending = descending
+
+    def __lt__(self, other):
+        """Compares column values in order, descending columns are compared reversed.
+
+        :param other: Other key.
+        :type other: _MergeKey
+        :rtype: bool
+        """
+        for value, other_value, descending in zip(self.values, other.values, self.descending):
+            if value != other_value:
+                return value > other_value if descending else value < other_value
+
+        return False
+
+
+class ShardedAdapter(AAdapter):
+    """Spreads rows of models over several MySQLAdapters by shard key:
+
+        PyAR.add_adapter(ShardedAdapter([MySQLAdapter(host='db1'), MySQLAdapter(host='db2')], 'tenant_id'))
+
+    Shard key is "_shard_key_" of the model or shard_key of the adapter. It's known before the row is inserted,
+    so it's either a column other than primary key or primary key generated by the caller. Every shard keeps
+    its own AUTO_INCREMENT counter, so auto increment primary keys must be made unique across shards
+    (auto_increment_increment / auto_increment_offset).
+    Reads with shard key equality condition (find(tenant_id=1)) and writes go to the shard of the key.
+    Other reads run on all shards in parallel and their rows are merged by simple column orders,
+    limit / offset are applied to the merged rows, aggregates aren't merged.
+    Transaction is started lazily on every shard written in it and these shards are committed one by one,
+    so commit is not atomic across shards.
+    """
+
+    __order_column = re.compile(r'^`?(?:\w+`?\.`?)?(\w+)`?$')
+    "Column of simple order expression, optionally with table name."
+
+    def __init__(self, shards, shard_key, strategy=None, workers=None):
+        """Constructor.
+
+        :param shards: Shard adapters.
+        :type shards: list<MySQLAdapter>
+        :param shard_key: Shard key of models without "_shard_key_".
+        :type shard_key: str
+        :param strategy: Shard strategy. HashShardStrategy by default.
+        :type strategy: IShardStrategy
+        :param workers: Number of threads which read shards in parallel. Number of shards by default.
+        :type workers: int
+        """
+        if not len(shards):
+            raise AdapterConfigKeyException('At least one shard is required.')
+
+        if not shard_key:
+            raise AdapterConfigKeyException('Shard key is required.')
+
+        self.__shards = list(shards)
+        self.__strategy = strategy if strategy is not None else HashShardStrategy()
+        self.__shard_key = shard_key
+        self.__workers = workers if workers is not None else len(self.__shards)
+        self.__executor = None
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        super().__init__()
+
+    def get_shards(self):
+        """Returns shard adapters.
+
+        :rtype: list<MySQLAdapter>
+        """
+        return list(self.__shards)
+
+    def get_strategy(self):
+        """Returns shard strategy.
+
+        :rtype: IShardStrategy
+        """
+        return self.__strategy
+
+    def get_shard_key(self, model_cls):
+        """Returns shard key of the model class.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: ASQLModel
+        :rtype: str
+        """
+        return getattr(model_cls, '_shard_key_', None) or self.__shard_key
+
+    def get_shard(self, key):
+        """Returns shard adapter of the key value or None if the key isn't mapped to any shard.
+
+        :param key: Shard key value.
+        :type key: mixed
+        :rtype: MySQLAdapter|None
+        """
+        number = self.__strategy.get_shard(key, len(self.__shards))
+
+        if number is None:
+            return None
+
+        if not 0 <= number < len(self.__shards):
+            raise SQLAdapterExecuteException('Shard [%s] of key [%s] does not exist.' % (number, key))
+
+        return self.__shards[number]
+
+    def close(self):
+        """Stops threads which read shards in parallel.
+
+        :rtype: None
+        """
+        with self.__lock:
+            if self.__executor is not None:
+                self.__executor.shutdown(wait=False)
+                self.__executor = None
+
+    def __get_executor(self):
+        """Returns thread pool of parallel reads.
+
+        :rtype: ThreadPoolExecutor
+        """
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(self.__workers)
+            return self.__executor
+
+    def __get_model_shard(self, model):
+        """Returns shard adapter of the model. Model must have shard key value.
+
+        :param model: PyAR model.
+        :type model: ASQLModel
+        :rtype: MySQLAdapter
+        """
+        key = self.get_shard_key(model.__class__)
+        value = model.get_data(False).get(key)
+        shard = self.get_shard(value) if value is not None else None
+
+        if shard is None:
+            raise SQLAdapterExecuteException('Shard of [%s] model with [%s = %s] is unknown.'
+                                             % (model.__class__.__name__, key, value))
+
+        return shard
+
+    def __call(self, shard, method, *args, **kwargs):
+        """Calls method of the shard and returns its result with the shard's last query and result.
+
+        :param shard: Shard adapter.
+        :type shard: MySQLAdapter
+        :param method: Adapter method name.
+        :type method: str
+        :rtype: tuple(mixed, str, Cursor)
+        """
+        result = getattr(shard, method)(*args, **kwargs)
+        return result, shard.get_last_query(), shard.get_last_result()
+
+    def __route(self, shard, method, *args, **kwargs):
+        """Calls method of a single shard.
+
+        :param shard: Shard adapter.
+        :type shard: MySQLAdapter
+        :param method: Adapter method name.
+        :type method: str
+        :rtype: mixed
+        """
+        result, self.__local.last_query, self.__local.last_result = self.__call(shard, method, *args, **kwargs)
+        return result
+
+    def __scatter(self, method, *args, **kwargs):
+        """Calls method of all shards and returns list of their results in the order of shards.
+        Shards are called in parallel threads, or one by one in the current thread while transaction is open,
+        so the transaction connections are used.
+
+        :param method: Adapter method name.
+        :type method: str
+        :rtype: list
+        """
+        if self.in_transaction() or len(self.__shards) == 1:
+            calls = [self.__call(shard, method, *args, **kwargs) for shard in self.__shards]
+        else:
+            calls = list(self.__get_executor().map(lambda shard: self.__call(shard, method, *args, **kwargs),
+                                                   self.__shards))
+
+        self.__local.last_query = ';\n'.join([query for result, query, cursor in calls if query is not None])
+        self.__local.last_result = calls[-1][2]
+        return [result for result, query, cursor in calls]
+
+    def __write(self, shard, method, *args):
+        """Calls write method of the shard. Starts transaction on the shard if the current thread has open one.
+
+        :param shard: Shard adapter.
+        :type shard: MySQLAdapter
+        :param method: Adapter method name.
+        :type method: str
+        :rtype: mixed
+        """
+        started = getattr(self.__local, 'transaction', None)
+
+        if started is not None and not any(shard is item for item in started):
+            shard.start_transaction()
+            started.append(shard)
+
+        return self.__route(shard, method, *args)
+
+    def __get_sort_keys(self, order):
+        """Returns (column, descending) pairs of order expression.
+
+        :param order: Order expression or list of expressions.
+        :type order: str|list|tuple|None
+        :rtype: list<tuple>
+        """
+        if order is None:
+            return []
+
+        if isinstance(order, (list, tuple)):
+            order = ', '.join(order)
+
+        keys = []
+
+        for item in order.split(','):
+            parts = item.split()
+
+            if not len(parts):
+                continue
+
+            match = self.__order_column.match(parts[0])
+
+            if match is None or len(parts) > 2 or (len(parts) == 2 and parts[1].upper() not in ('ASC', 'DESC')):
+                raise SQLAdapterExecuteException('Can\'t merge shards ordered by [%s].' % item.strip())
+
+            keys.append((match.group(1), len(parts) == 2 and parts[1].upper() == 'DESC'))
+
+        return keys
+
+    @staticmethod
+    def __get_merge_key(keys):
+        """Returns function which makes merge key of model or dict row. NULL values are the lowest ones like in MySQL.
+
+        :param keys: (column, descending) pairs.
+        :type keys: list<tuple>
+        :rtype: callable
+        """
+        columns = [column for column, descending in keys]
+        descending = [descending for column, descending in keys]
+
+        def get_key(row):
+            data = row if isinstance(row, collections.abc.Mapping) else row.get_data(False)
+            return _MergeKey([(data.get(column) is not None, data.get(column)) for column in columns], descending)
+
+        return get_key
+
+    def read(self, model_cls, limit=None, offset=None, order=None, stream=False, **kwargs):
+        """Reads from the shard of shard key equality condition or from all shards.
+        Takes the same arguments as MySQLAdapter.read.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: ASQLModel
+        :rtype: list|iterator
+        """
+        super().read(model_cls)
+
+        key = self.get_shard_key(model_cls)
+        shard = self.get_shard(kwargs[key]) if key in kwargs else None
+
+        if shard is not None:
+            return self.__route(shard, 'read', model_cls, limit=limit, offset=offset, order=order, stream=stream,
+                                **kwargs)
+
+        keys = self.__get_sort_keys(order)
+
+        if len(keys) and kwargs.get('raw') == 'tuple':
+            raise SQLAdapterExecuteException('Can\'t merge ordered tuple rows of shards.')
+
+        start = offset or 0
+        stop = start + limit if limit is not None else None
+        shard_limit = stop
+
+        if stream:
+            # Every shard streams its rows ordered, so they are merged lazily.
+            streams = [shard.read(model_cls, limit=shard_limit, order=order, stream=True, **kwargs)
+                       for shard in self.__shards]
+            rows = heapq.merge(*streams, key=self.__get_merge_key(keys)) if len(keys) \
+                else itertools.chain.from_iterable(streams)
+            return itertools.islice(rows, start, stop)
+
+        rows = list(itertools.chain.from_iterable(
+            self.__scatter('read', model_cls, limit=shard_limit, order=order, **kwargs)))
+
+        if len(keys) and len(self.__shards) > 1:
+            rows.sort(key=self.__get_merge_key(keys))
+
+        return rows[start:stop] if start or stop is not None else rows
+
+    def iter_read(self, model_cls, **kwargs):
+        """Reads rows one by one from the shard of shard key or from all shards one after another.
+
+        :param model_cls: PyAR model class.
+        :type model_cls: ASQLModel
+        :rtype: iterator
+        """
+        return self.read(model_cls, stream=True, **kwargs)
+
+    def read_template(self, model_cls, template, params=None, raw=False):
+        """Executes query template on the shard of shard key equality condition or on all shards.
+        Rows of all shards are concatenated without merging of order and limit.
+
+        :rtype: list
+        """
+        key = self.get_shard_key(model_cls)
+        shard = None
+
+        if params is not None and key in params \
+                and '%s.%s = %%(%s)s' % (model_cls.get_resource(), key, key) in template:
+            shard = self.get_shard(params[key])
+
+        if shard is not None:
+            return self.__route(shard, 'read_template', model_cls, template, params, raw)
+
+        return list(itertools.chain.from_iterable(self.__scatter('read_template', model_cls, template, params, raw)))
+
+    def read_rows(self, query, params=None, cursor_type=None):
+        """Executes query on all shards and returns their rows concatenated.
+        Aggregate queries return one row per shard.
+
+        :rtype: list
+        """
+        return list(itertools.chain.from_iterable(self.__scatter('read_rows', query, params, cursor_type)))
+
+    def build_read_query(self, model_cls, **kwargs):
+        """Builds SQL query. See MySQLAdapter.build_read_query.
+
+        :rtype: str
+        """
+        return self.__shards[0].build_read_query(model_cls, **kwargs)
+
+    def compile_read(self, model_cls, **kwargs):
+        """Builds SQL query and translates its placeholders. See MySQLAdapter.compile_read.
+
+        :rtype: tuple(str, frozenset)
+        """
+        return self.__shards[0].compile_read(model_cls, **kwargs)
+
+    def get_query_template(self, query, keys):
+        """Translates ":key" placeholders of the query. See MySQLAdapter.get_query_template.
+
+        :rtype: str
+        """
+        return self.__shards[0].get_query_template(query, keys)
+
+    def create(self, model, **kwargs):
+        """Creates model on the shard of its shard key.
+
+        :rtype: bool
+        """
+        return self.__write(self.__get_model_shard(model), 'create', model)
+
+    def update(self, model, **kwargs):
+        """Updates model on the shard of its shard key.
+
+        :rtype: bool
+        """
+        return self.__write(self.__get_model_shard(model), 'update', model)
+
+    def delete(self, model, **kwargs):
+        """Deletes model on the shard of its shard key.
+
+        :rtype: bool
+        """
+        return self.__write(self.__get_model_shard(model), 'delete', model)
+
+    def __bulk(self, method, model_cls, models, *args):
+        """Calls bulk method of every shard with its models.
+
+        :param method: Adapter method name.
+        :type method: str
+        :param model_cls: PyAR model class.
+        :type model_cls: ASQLModel
+        :param models: Models.
+        :type models: list<ASQLModel>
+        :rtype: bool
+        """
+        groups = collections.OrderedDict()
+
+        for model in models:
+            shard = self.__get_model_shard(model)
+            groups.setdefault(id(shard), (shard, []))[1].append(model)
+
+        for shard, group in groups.values():
+            self.__write(shard, method, model_cls, group, *args)
+
+        return True
+
+    def bulk_create(self, model_cls, models, batch_size=1000):
+        """Creates models on the shards of their shard keys. See MySQLAdapter.bulk_create.
+
+        :rtype: bool
+        """
+        return self.__bulk('bulk_create', model_cls, models, batch_size)
+
+    def bulk_upsert(self, model_cls, models, fields=None, batch_size=1000):
+        """Upserts models on the shards of their shard keys. See MySQLAdapter.bulk_upsert.
+
+        :rtype: bool
+        """
+        return self.__bulk('bulk_upsert', model_cls, models, fields, batch_size)
+
+    def bulk_update(self, model_cls, models, fields=None, batch_size=1000):
+        """Updates models on the shards of their shard keys. See MySQLAdapter.bulk_update.
+
+        :rtype: bool
+        """
+        return self.__bulk('bulk_update', model_cls, models, fields, batch_size)
+
+    def start_transaction(self):
+        """Opens transaction of the current thread. It's started on shards when they are written.
+
+        :rtype: None
+        """
+        if self.in_transaction():
+            raise SQLAdapterExecuteException('Transaction is already started.')
+
+        self.__local.transaction = []
+        self.__local.last_query = 'START TRANSACTION'
+        self.__local.last_result = None
+
+    def commit_transaction(self):
+        """Commits transaction on all written shards. Shards which aren't committed yet are rolled back
+        if commit of a shard fails.
+
+        :rtype: None
+        """
+        self.__finish_transaction('commit_transaction')
+
+    def rollback_transaction(self):
+        """Rolls back transaction on all written shards.
+
+        :rtype: None
+        """
+        self.__finish_transaction('rollback_transaction')
+
+    def __finish_transaction(self, method):
+        """Commits or rolls back transaction on all written shards.
+
+        :param method: Adapter method name.
+        :type method: str
+        :rtype: None
+        """
+        started = getattr(self.__local, 'transaction', None) or []
+        self.__local.transaction = None
+
+        for number, shard in enumerate(started):
+            try:
+                getattr(shard, method)()
+            except Exception:
+                for rest in started[number + 1:]:
+                    rest.rollback_transaction()
+                raise
+
+        self.__local.last_query = 'COMMIT' if method == 'commit_transaction' else 'ROLLBACK'
+        self.__local.last_result = None
+
+    def in_transaction(self):
+        """Returns whether the current thread has open transaction.
+
+        :rtype: bool
+        """
+        return getattr(self.__local, 'transaction', None) is not None
+
+    def get_columns(self, resource):
+        """Returns table columns information of the first shard.
+
+        :rtype: dict
+        """
+        return self.__shards[0].get_columns(resource)
+
+    def get_last_query(self):
+        """Returns last query of the current thread. Queries of all shards are joined by ";".
+
+        :rtype: str
+        """
+        return getattr(self.__local, 'last_query', None)
+
+    def get_last_result(self):
+        """Returns last result of the current thread, which is cursor of the last shard on reads of all shards.
+
+        :rtype: Cursor
+        """
+        return getattr(self.__local, 'last_result', None)
@@ -0,0 +1,56 @@
+"""
+    PyAR asynchronous adapter interface package.
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :license:
+        This code is a part of Communication Interface for Import/Export,
+        which is a proprietary subject of its rightful owners. Any form of
+        copy or distribution is forbidden without written permission.
+
+    :copyright:
+        Copyright (c) 2014 symmetrics - a CGI Group brand
+
+    :author:
+        symmetrics - a CGI Group brand <info@symmetrics.de>
+        Oleg Bronzov <oleg.bronzov@symmetrics.de>,
+"""
+
+
+class AsyncIAdapter(object):
+    """Asynchronous adapter interface. Methods are coroutines."""
+
+    async def read(self, model_cls, **kwargs):
+        """Read method.
+
+        :param model_cls: PyAR model class.
+        :type IModel
+        :rtype: list
+        """
+        pass
+
+    async def create(self, model, **kwargs):
+        """Create model.
+
+        :param model: PyAR model.
+        :type IModel
+        :rtype: bool
+        """
+        pass
+
+    async def update(self, model, **kwargs):
+        """Update model.
+
+        :param model: PyAR model.
+        :type IModel
+        :rtype: bool
+        """
+        pass
+
+    async def delete(self, model, **kwargs):
+        """Delete model.
+
+        :param model: PyAR model.
+        :type IModel
+        :rtype: bool
+        """
+        pass
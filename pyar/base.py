@@ -16,6 +16,7 @@
 """
 
 
+from .async_adapter import AsyncIAdapter
 from .exception import AdapterTypeException, AdapterNotExistsException, ModelNotExistsException
 
 
@@ -33,13 +34,13 @@ class PyAR(object):
         """Adds new adapter. If name is not specified it adds adapter as default.
 
         :param adapter: PyAR adapter obj.
-        :type: IAdapter
+        :type: IAdapter|AsyncIAdapter
         :param name: Adapter name.
         :type name: str
         :rtype: None
         """
-        if not isinstance(adapter, IAdapter):
-            raise AdapterTypeException('Adapter must be an instance of IAdapter.')
+        if not isinstance(adapter, (IAdapter, AsyncIAdapter)):
+            raise AdapterTypeException('Adapter must be an instance of IAdapter or AsyncIAdapter.')
 
         cls.__adapters[name] = adapter
 
@@ -49,7 +50,7 @@ class PyAR(object):
 
         :param name: Adapter name.
         :type name: str
-        :rtype: IAdapter
+        :rtype: IAdapter|AsyncIAdapter
         """
         if not name in cls.__adapters:
             raise AdapterNotExistsException('Adapter [%s] does not exists.' % name)
@@ -84,4 +85,4 @@ class PyAR(object):
         cls.__models[model_cls.__name__] = model_cls
 
 
-from .adapter import IAdapter
\ No newline at end of file
+from .adapter import IAdapter
@@ -70,3 +70,8 @@ class SQLAdapterExecuteException(PyARException):
     """SQL adapter execute exception."""
     pass
 
+
+
+class PaginationCursorException(PyARException):
+    """Invalid pagination cursor exception."""
+    pass
@@ -0,0 +1,133 @@
+"""
+    PyAR identity map package.
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :license:
+        This code is a part of Communication Interface for Import/Export,
+        which is a proprietary subject of its rightful owners. Any form of
+        copy or distribution is forbidden without written permission.
+
+    :copyright:
+        Copyright (c) 2014 symmetrics - a CGI Group brand
+
+    :author:
+        symmetrics - a CGI Group brand <info@symmetrics.de>
+        Oleg Bronzov <oleg.bronzov@symmetrics.de>,
+"""
+
+
+import threading
+import weakref
+
+
+class IdentityMap(object):
+    """First level cache of loaded models keyed by model class and primary key.
+    The map is active in the current thread inside of "with" block:
+
+        with IdentityMap():
+            Project.find_by_id(1) is Project.find_by_id(1)  # True
+    """
+
+    __local = threading.local()
+    "Thread local stack of active maps."
+
+    def __init__(self, weak=True):
+        """Constructor.
+
+        :param weak: Keeps weak references, so models disappear from the map once nothing uses them.
+        :type weak: bool
+        """
+        self.__models = weakref.WeakValueDictionary() if weak else dict()
+
+    @classmethod
+    def get_current(cls):
+        """Returns innermost active map of the current thread or None.
+
+        :rtype: IdentityMap|None
+        """
+        stack = getattr(cls.__local, 'stack', None)
+        return stack[-1] if stack else None
+
+    @staticmethod
+    def __key(model_cls, id):
+        """Returns map key.
+
+        :param model_cls: PyAR sql model class.
+        :type model_cls: ASQLModel
+        :param id: Primary key value.
+        :type id: int|str
+        :rtype: tuple
+        """
+        return model_cls, str(id)
+
+    def get(self, model_cls, id):
+        """Returns model by primary key or None if it isn't in the map.
+
+        :param model_cls: PyAR sql model class.
+        :type model_cls: ASQLModel
+        :param id: Primary key value.
+        :type id: int|str
+        :rtype: ASQLModel|None
+        """
+        return self.__models.get(self.__key(model_cls, id))
+
+    def add(self, model):
+        """Adds model to the map and returns the model which is already stored with the same key, if any.
+
+        :param model: PyAR sql model.
+        :type model: ASQLModel
+        :rtype: ASQLModel
+        """
+        if model.get_id() is None:
+            return model
+
+        key = self.__key(model.__class__, model.get_id())
+        existing = self.__models.get(key)
+
+        if existing is not None:
+            return existing
+
+        self.__models[key] = model
+        return model
+
+    def remove(self, model):
+        """Removes model from the map.
+
+        :param model: PyAR sql model.
+        :type model: ASQLModel
+        :rtype: None
+        """
+        if model.get_id() is not None:
+            self.__models.pop(self.__key(model.__class__, model.get_id()), None)
+
+    def clear(self):
+        """Removes all models from the map.
+
+        :rtype: None
+        """
+        self.__models.clear()
+
+    def __len__(self):
+        """Returns number of models in the map.
+
+        :rtype: int
+        """
+        return len(self.__models)
+
+    def __enter__(self):
+        """Activates the map in the current thread.
+
+        :rtype: IdentityMap
+        """
+        if getattr(self.__local, 'stack', None) is None:
+            self.__local.stack = []
+        self.__local.stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Deactivates the map and removes its models.
+
+        :rtype: None
+        """
+        self.__local.stack.remove(self)
+        self.clear()
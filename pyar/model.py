@@ -17,7 +17,15 @@
 
 
 import re
-
+import copy
+import json
+import asyncio
+import functools
+import types
+import collections
+import collections.abc
+
+from .async_adapter import AsyncIAdapter
 from .base import PyAR
 
 from .exception import ModelFieldNameException
@@ -40,7 +48,7 @@ class IModelData(object):
 
         :param with_models: Adds information about nested models to the dict.
         :type with_models: bool
-        :rtype: dict
+        :rtype: Mapping
         """
         pass
 
@@ -52,17 +60,42 @@ class IModelData(object):
         pass
 
     def get_origin_data(self):
-        """Returns models origin data.
+        """Returns read-only view of models origin data.
+
+        :rtype: Mapping
+        """
+        pass
+
+    def get_dirty_data(self):
+        """Returns data of fields changed since the model was loaded or saved.
 
         :rtype: dict
         """
         pass
 
-    def to_dict(self, with_models=True):
+    def is_dirty(self):
+        """Returns whether some field was changed since the model was loaded or saved.
+
+        :rtype: bool
+        """
+        pass
+
+    def mark_clean(self, fields=None):
+        """Takes current values as origin data, so they aren't dirty anymore.
+
+        :param fields: Field names. All fields by default.
+        :type fields: list
+        :rtype: None
+        """
+        pass
+
+    def to_dict(self, with_models=True, depth=None):
         """Returns dict representation of model.
 
         :param with_models: Adds information about nested models to the dict.
         :type with_models: bool
+        :param depth: Maximum nesting level of models. None means unlimited.
+        :type depth: int
         :rtype: dict
         """
         pass
@@ -95,6 +128,14 @@ class IModelAdapter(object):
         """
         pass
 
+    @classmethod
+    def iter_find(cls, **kwargs):
+        """Find entities and yields them one by one.
+
+        :rtype: iterator
+        """
+        pass
+
     @classmethod
     def find_one(cls, **kwargs):
         """Returns firs element of found entities.
@@ -131,6 +172,50 @@ class IModelAdapter(object):
         """
         pass
 
+    @classmethod
+    async def afind(cls, **kwargs):
+        """Coroutine of find.
+
+        :rtype: list
+        """
+        pass
+
+    @classmethod
+    async def afind_one(cls, **kwargs):
+        """Coroutine of find_one.
+
+        :rtype: IModel|None
+        """
+        pass
+
+    async def acreate(self, **kwargs):
+        """Coroutine of create.
+
+        :rtype: bool
+        """
+        pass
+
+    async def aupdate(self, **kwargs):
+        """Coroutine of update.
+
+        :rtype: bool
+        """
+        pass
+
+    async def adelete(self, **kwargs):
+        """Coroutine of delete.
+
+        :rtype: bool
+        """
+        pass
+
+    async def asave(self, **kwargs):
+        """Coroutine of save.
+
+        :rtype: bool
+        """
+        pass
+
 
 class IModelNew(object):
     """Is model new interface."""
@@ -164,20 +249,150 @@ class IModel(IModelAdapter, IModelData, IModelNew):
         pass
 
 
+class ModelRow(collections.abc.MutableMapping):
+    """Models data stored in a list ordered by declared columns of the model class.
+    Fields which aren't declared columns are kept in a dict.
+    """
+
+    __slots__ = ('__index', '__values', '__extra')
+
+    __missing = object()
+    "Value of not set column."
+
+    def __init__(self, index, values=None, extra=None):
+        """Constructor.
+
+        :param index: Positions of columns keyed by column name.
+        :type index: dict
+        :param values: Column values.
+        :type values: list
+        :param extra: Values of not declared fields.
+        :type extra: dict
+        """
+        self.__index = index
+        self.__values = values if values is not None else [self.__missing] * len(index)
+        self.__extra = extra
+
+    def __getitem__(self, key):
+        """Returns field value.
+
+        :param key: Field name.
+        :type key: str
+        :rtype: mixed
+        """
+        position = self.__index.get(key)
+
+        if position is not None:
+            value = self.__values[position]
+            if value is not self.__missing:
+                return value
+        elif self.__extra is not None and key in self.__extra:
+            return self.__extra[key]
+
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        """Sets field value.
+
+        :param key: Field name.
+        :type key: str
+        :param value: Field value.
+        :rtype: None
+        """
+        position = self.__index.get(key)
+
+        if position is not None:
+            self.__values[position] = value
+        else:
+            if self.__extra is None:
+                self.__extra = dict()
+            self.__extra[key] = value
+
+    def __delitem__(self, key):
+        """Removes field.
+
+        :param key: Field name.
+        :type key: str
+        :rtype: None
+        """
+        position = self.__index.get(key)
+
+        if position is not None and self.__values[position] is not self.__missing:
+            self.__values[position] = self.__missing
+        elif position is None and self.__extra is not None and key in self.__extra:
+            del self.__extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        """Returns whether field is set.
+
+        :param key: Field name.
+        :type key: str
+        :rtype: bool
+        """
+        position = self.__index.get(key)
+
+        if position is not None:
+            return self.__values[position] is not self.__missing
+
+        return self.__extra is not None and key in self.__extra
+
+    def __iter__(self):
+        """Iterates names of set fields.
+
+        :rtype: iterator
+        """
+        for key, position in self.__index.items():
+            if self.__values[position] is not self.__missing:
+                yield key
+
+        if self.__extra is not None:
+            yield from list(self.__extra)
+
+    def __len__(self):
+        """Returns number of set fields.
+
+        :rtype: int
+        """
+        return len(self.__values) - self.__values.count(self.__missing) + len(self.__extra or ())
+
+    def copy(self):
+        """Returns shallow copy.
+
+        :rtype: ModelRow
+        """
+        return self.__class__(self.__index, list(self.__values), dict(self.__extra) if self.__extra else None)
+
+
 class AModelData(IModelData, IModelNew):
     """Provides interfaces to work with data."""
 
+    _columns_ = None
+    "Declared column names. Models of classes with declared columns keep their data in compact ModelRow."
+
+    _column_index_ = None
+    "Positions of declared columns keyed by name. Computed by ModelMetaRegister."
+
+    _nested_models_ = dict()
+    "Nested model classes keyed by field name. Computed by ModelMetaRegister."
+
+    _descriptors_ = dict()
+    "Property descriptors (e.g. relations) keyed by field name. Computed by ModelMetaRegister."
+
     def __init__(self, data=None):
         """Sets data into model.
+        Given fields are dirty until the model is saved or marked clean, adapters mark loaded models clean.
 
         :param data: Models data.
         :type data: dict
         """
-        self.__origin_data = dict()
-        self.__data = dict()
+        index = self._column_index_
+        self.__origin_data = dict() if index is None else ModelRow(index)
+        self.__data = dict() if index is None else ModelRow(index)
+        self.__dirty = None
 
         if isinstance(data, dict):
-            self.__origin_data = data
             self.set_data(data)
 
         super().__init__()
@@ -202,47 +417,174 @@ class AModelData(IModelData, IModelNew):
         """
         ret = dict()
 
-        for key, value in self.__dict__.items():
-            if isinstance(value, IModel):
+        for key in self._nested_models_:
+            value = self.__dict__.get(key)
+            if value is not None:
                 ret[key] = value
 
         return ret
 
     def get_data(self, with_models=True):
-        """Returns models data.
+        """Returns read-only view of models data. The view reflects later changes of the model.
 
-        :param with_models: Adds information about nested models to the dict.
+        :param with_models: Adds information about nested models to the view.
         :type with_models: bool
-        :rtype: dict
+        :rtype: Mapping
         """
-        ret = self.__data
-
         if with_models:
-            ret.update(self.get_data_models())
+            models = self.get_data_models()
+            if len(models):
+                return types.MappingProxyType(collections.ChainMap(models, self.__data))
 
-        return ret
+        return types.MappingProxyType(self.__data)
 
     def get_origin_data(self):
-        """Returns models origin data.
+        """Returns read-only view of models origin data. It's a dict or a ModelRow for models with declared columns.
+
+        :rtype: Mapping
+        """
+        return types.MappingProxyType(self.__origin_data)
+
+    def get_dirty_data(self):
+        """Returns data of fields changed since the model was loaded or saved.
+        List, dict and set values changed in place are dirty too.
+
+        :rtype: dict
+        """
+        keys = self.__get_changed_mutable()
+
+        if self.__dirty:
+            keys.update(self.__dirty)
+
+        return dict((key, self.__data[key]) for key in keys)
+
+    def is_dirty(self):
+        """Returns whether some field was changed since the model was loaded or saved.
+
+        :rtype: bool
+        """
+        return bool(self.__dirty) or bool(self.__get_changed_mutable())
+
+    def __get_changed_mutable(self):
+        """Returns names of list, dict and set fields which differ from their origin copies.
+
+        :rtype: set
+        """
+        return set([key for key, value in self.__origin_data.items()
+                    if isinstance(value, (list, dict, set)) and self.__data.get(key) != value])
+
+    def mark_clean(self, fields=None):
+        """Takes current values as origin data, so they aren't dirty anymore.
+        List, dict and set values are copied deeply, so their changes in place are seen as dirty.
+
+        :param fields: Field names. All fields by default.
+        :type fields: list
+        :rtype: None
+        """
+        if fields is None:
+            self.__origin_data = self.__data.copy()
+            self.__dirty = None
+            fields = [key for key, value in self.__data.items() if isinstance(value, (list, dict, set))]
 
+        for key in fields:
+            if key in self.__data:
+                value = self.__data[key]
+                self.__origin_data[key] = copy.deepcopy(value) if isinstance(value, (list, dict, set)) else value
+            if self.__dirty:
+                self.__dirty.discard(key)
+
+    def to_dict(self, with_models=True, depth=None):
+        """Returns dict representation of model.
+        Models nested deeper than depth and models which are already being converted (cycles) are left out.
+
+        :param with_models: Adds information about nested models to the dict.
+        :type with_models: bool
+        :param depth: Maximum nesting level of models. None means unlimited.
+        :type depth: int
         :rtype: dict
         """
-        return self.__origin_data
+        return self._to_dict(with_models, depth, set())
 
-    def to_dict(self, with_models=True):
+    def _to_dict(self, with_models, depth, path):
         """Returns dict representation of model.
 
         :param with_models: Adds information about nested models to the dict.
         :type with_models: bool
+        :param depth: Maximum nesting level of models. None means unlimited.
+        :type depth: int
+        :param path: Ids of models which are being converted.
+        :type path: set
         :rtype: dict
         """
-        ret = dict()
+        ret = dict(self.__data)
+        models = [(key, value) for key, value in ret.items() if isinstance(value, IModel)]
+
+        if with_models:
+            models.extend(self.get_data_models().items())
+
+        if not len(models):
+            return ret
 
-        for key, value in self.get_data(with_models).items():
-            ret[key] = value if not isinstance(value, IModel) else value.to_dict(with_models)
+        path.add(id(self))
+
+        for key, value in models:
+            if (depth is not None and depth <= 0) or id(value) in path:
+                ret.pop(key, None)
+            else:
+                ret[key] = value._to_dict(with_models, None if depth is None else depth - 1, path)
 
+        path.discard(id(self))
         return ret
 
+    @staticmethod
+    def to_dicts(models, with_models=True, depth=None):
+        """Returns dict representations of models.
+
+        :param models: Models.
+        :type models: list
+        :param with_models: Adds information about nested models to the dicts.
+        :type with_models: bool
+        :param depth: Maximum nesting level of models. None means unlimited.
+        :type depth: int
+        :rtype: list
+        """
+        return [model.to_dict(with_models, depth) for model in models]
+
+    @staticmethod
+    def write_json_lines(models, stream, with_models=True, depth=None, default=str):
+        """Writes models into stream as JSON lines, one object per model.
+        Encoded keys are reused for models with the same fields, so only values are encoded per model.
+
+        :param models: Models.
+        :type models: list|iterator
+        :param stream: Text stream.
+        :type stream: TextIO
+        :param with_models: Adds information about nested models to the objects.
+        :type with_models: bool
+        :param depth: Maximum nesting level of models. None means unlimited.
+        :type depth: int
+        :param default: Converts values which JSON doesn't support (dates, decimals).
+        :type default: callable
+        :rtype: int
+        """
+        encode = json.JSONEncoder(default=default).encode
+        prefixes = dict()
+        count = 0
+
+        for model in models:
+            data = model.to_dict(with_models, depth)
+            keys = tuple(data)
+            key_prefixes = prefixes.get(keys)
+
+            if key_prefixes is None:
+                key_prefixes = prefixes[keys] = [encode(key) + ': ' for key in keys]
+
+            stream.write('{' + ', '.join([prefix + encode(value)
+                                           for prefix, value in zip(key_prefixes, data.values())]) + '}\n')
+            count += 1
+
+        return count
+
     def __setattr__(self, key, value):
         """Sets models attribute.
 
@@ -252,17 +594,32 @@ class AModelData(IModelData, IModelNew):
         :type value: str|dict|list
         :rtype: None
         """
-        if key[0] != '_':
-            if getattr(self, key) is not None \
-                    and hasattr(self.__class__, key) \
-                    and issubclass(getattr(self.__class__, key), IModel):
-                super().__setattr__(key, getattr(self.__class__, key)(value, self.is_new()))
-                if key in self.__data:
-                    self.__data.pop(key)
-            else:
-                self.__data[key] = value
-        else:
+        if key[0] == '_':
+            super().__setattr__(key, value)
+            return
+
+        model_cls = self._nested_models_.get(key)
+
+        if model_cls is not None:
+            super().__setattr__(key, model_cls(value, self.is_new()))
+            self.__data.pop(key, None)
+            return
+
+        descriptor = self._descriptors_.get(key)
+
+        if descriptor is not None and descriptor.fset is not None:
             super().__setattr__(key, value)
+            return
+
+        self.__data[key] = value
+
+        if key in self.__origin_data and self.__origin_data[key] == value:
+            if self.__dirty:
+                self.__dirty.discard(key)
+        elif self.__dirty is None:
+            self.__dirty = {key}
+        else:
+            self.__dirty.add(key)
 
     def __getattr__(self, key):
         """Returns attributes value if key exists and None otherwise.
@@ -271,9 +628,7 @@ class AModelData(IModelData, IModelNew):
         :type key: str
         :rtype: str|list|dict|None
         """
-        if key in self.__data:
-            return self.__data[key]
-        return None
+        return self.__data.get(key)
 
     def __delattr__(self, key):
         """Removes models attribute.
@@ -284,6 +639,8 @@ class AModelData(IModelData, IModelNew):
         """
         if key in self.__data:
             del self.__data[key]
+            if self.__dirty:
+                self.__dirty.discard(key)
         else:
             super().__delattr__(key)
 
@@ -355,6 +712,14 @@ class AModelAdapter(IModelAdapter):
         """
         return cls.get_read_adapter_inst().read(cls, **kwargs)
 
+    @classmethod
+    def iter_find(cls, **kwargs):
+        """Find entities and yields them one by one.
+
+        :rtype: iterator
+        """
+        return cls.get_read_adapter_inst().iter_read(cls, **kwargs)
+
     @classmethod
     def find_one(cls, **kwargs):
         """Returns firs element of found entities.
@@ -395,6 +760,84 @@ class AModelAdapter(IModelAdapter):
         else:
             return self.update(**kwargs)
 
+    @staticmethod
+    async def _run_sync(method, **kwargs):
+        """Runs synchronous method in the default executor of the running event loop.
+
+        :param method: Synchronous method.
+        :type method: callable
+        :rtype: mixed
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(method, **kwargs))
+
+    @classmethod
+    async def afind(cls, **kwargs):
+        """Coroutine of find. Synchronous adapters are called in executor thread.
+
+        :rtype: list
+        """
+        adapter = cls.get_read_adapter_inst()
+
+        if isinstance(adapter, AsyncIAdapter):
+            return await adapter.read(cls, **kwargs)
+
+        return await cls._run_sync(cls.find, **kwargs)
+
+    @classmethod
+    async def afind_one(cls, **kwargs):
+        """Coroutine of find_one.
+
+        :rtype: IModel|None
+        """
+        result = await cls.afind(**kwargs)
+        return result[0] if len(result) else None
+
+    async def acreate(self, **kwargs):
+        """Coroutine of create. Synchronous adapters are called in executor thread.
+
+        :rtype: bool
+        """
+        adapter = self.get_write_adapter_inst()
+
+        if isinstance(adapter, AsyncIAdapter):
+            return await adapter.create(self, **kwargs)
+
+        return await self._run_sync(self.create, **kwargs)
+
+    async def aupdate(self, **kwargs):
+        """Coroutine of update. Synchronous adapters are called in executor thread.
+
+        :rtype: bool
+        """
+        adapter = self.get_write_adapter_inst()
+
+        if isinstance(adapter, AsyncIAdapter):
+            return await adapter.update(self, **kwargs)
+
+        return await self._run_sync(self.update, **kwargs)
+
+    async def adelete(self, **kwargs):
+        """Coroutine of delete. Synchronous adapters are called in executor thread.
+
+        :rtype: bool
+        """
+        adapter = self.get_write_adapter_inst()
+
+        if isinstance(adapter, AsyncIAdapter):
+            return await adapter.delete(self, **kwargs)
+
+        return await self._run_sync(self.delete, **kwargs)
+
+    async def asave(self, **kwargs):
+        """Coroutine of save.
+
+        :rtype: bool
+        """
+        if self.is_new():
+            return await self.acreate(**kwargs)
+        else:
+            return await self.aupdate(**kwargs)
+
 
 class ModelMetaRegister(type):
     """PyAR model register class."""
@@ -408,9 +851,57 @@ class ModelMetaRegister(type):
         :rtype: IModel
         """
         new_cls = type.__new__(cls, name, bases, attrs)
+        cls.__build_layout(new_cls)
         PyAR.add_model(new_cls)
         return new_cls
 
+    def __setattr__(cls, key, value):
+        """Sets class attribute and rebuilds field layout of the class and its subclasses if the field changes.
+
+        :param key: Attribute name.
+        :type key: str
+        :param value: Attribute value.
+        :rtype: None
+        """
+        type.__setattr__(cls, key, value)
+
+        if key[0] != '_' or key == '_columns_':
+            pending = [cls]
+            while len(pending):
+                model_cls = pending.pop()
+                ModelMetaRegister.__build_layout(model_cls)
+                pending.extend(model_cls.__subclasses__())
+
+    @staticmethod
+    def __build_layout(model_cls):
+        """Computes field layout of the model class once, so setting of model fields doesn't inspect the class.
+
+        :param model_cls: Model class.
+        :type model_cls: IModel
+        :rtype: None
+        """
+        nested_models = dict()
+        descriptors = dict()
+
+        for key in dir(model_cls):
+            if key[0] == '_':
+                continue
+
+            value = getattr(model_cls, key, None)
+
+            if isinstance(value, type) and issubclass(value, IModel):
+                nested_models[key] = value
+            elif isinstance(value, property):
+                descriptors[key] = value
+
+        columns = getattr(model_cls, '_columns_', None)
+
+        type.__setattr__(model_cls, '_nested_models_', nested_models)
+        type.__setattr__(model_cls, '_descriptors_', descriptors)
+        type.__setattr__(model_cls, '_column_index_',
+                         dict((column, position) for position, column in enumerate(columns))
+                         if columns is not None else None)
+
 
 class AModel(IModel, AModelData, AModelAdapter, metaclass=ModelMetaRegister):
     """PyAR abstract model."""
@@ -455,4 +946,3 @@ class AModel(IModel, AModelData, AModelAdapter, metaclass=ModelMetaRegister):
             return '_'.join([item.lower() for item in re.findall('[A-Z][a-z]*', cls.__name__)])
 
         return cls._resource_
-
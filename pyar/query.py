@@ -0,0 +1,542 @@
+"""
+    PyAR sql query package.
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    :license:
+        This code is a part of Communication Interface for Import/Export,
+        which is a proprietary subject of its rightful owners. Any form of
+        copy or distribution is forbidden without written permission.
+
+    :copyright:
+        Copyright (c) 2014 symmetrics - a CGI Group brand
+
+    :author:
+        symmetrics - a CGI Group brand <info@symmetrics.de>
+        Oleg Bronzov <oleg.bronzov@symmetrics.de>,
+"""
+
+
+import collections
+import threading
+
+import pymysql
+
+from .exception import SQLAdapterExecuteException
+
+
+class CompiledSQLQuery(object):
+    """Query which SQL text is built once. Fetching only binds parameter values."""
+
+    def __init__(self, model_cls, template, keys, full_rows=True):
+        """Constructor.
+
+        :param model_cls: PyAR sql model class.
+        :type model_cls: ASQLModel
+        :param template: Query template with driver's placeholders.
+        :type template: str
+        :param keys: Names of query parameters.
+        :type keys: frozenset
+        :param full_rows: Shows whether query selects all columns, so models can be put into identity map.
+        :type full_rows: bool
+        """
+        self.__model_cls = model_cls
+        self.__template = template
+        self.__keys = keys
+        self.__full_rows = full_rows
+
+    def get_template(self):
+        """Returns query template.
+
+        :rtype: str
+        """
+        return self.__template
+
+    def get_keys(self):
+        """Returns names of query parameters.
+
+        :rtype: frozenset
+        """
+        return self.__keys
+
+    def fetch(self, **params):
+        """Executes query with the given parameters and returns list of models.
+
+        :param params: Query parameters.
+        :type params: dict
+        :rtype: list
+        """
+        for key in self.__keys:
+            if key not in params:
+                raise SQLAdapterExecuteException('Query parameter [%s] is missing.' % key)
+
+        adapter = self.__model_cls.get_read_adapter_inst()
+        result = adapter.read_template(self.__model_cls, self.__template, params if len(self.__keys) else None)
+        return self.__model_cls._set_find_result(adapter, result, self.__full_rows)
+
+    def fetch_one(self, **params):
+        """Executes query with the given parameters and returns first model or None.
+
+        :param params: Query parameters.
+        :type params: dict
+        :rtype: ASQLModel|None
+        """
+        result = self.fetch(**params)
+        return result[0] if len(result) else None
+
+
+class SQLQuery(object):
+    """Find query of sql model. Holds find arguments (query shape) without parameter values."""
+
+    __compiled = collections.OrderedDict()
+    "Compiled queries keyed by model class, read adapter and query shape."
+
+    __compiled_lock = threading.Lock()
+    "Compiled queries lock."
+
+    compiled_cache_size = 1024
+    "Maximum number of compiled queries."
+
+    def __init__(self, model_cls, select=None, joins=None, where=None, having=None, limit=None, offset=None,
+                 distinct=False, group=None, order=None, use_index=None, force_index=None, by=()):
+        """Constructor. Takes the same arguments as ASQLModelFinder.find except parameter values.
+
+        :param model_cls: PyAR sql model class.
+        :type model_cls: ASQLModel
+        :param by: Names of fields compared for equality with parameters of the same name.
+        :type by: list
+        """
+        self.__model_cls = model_cls
+        self.__options = {
+            'select': select,
+            'joins': joins,
+            'where': where,
+            'having': having,
+            'limit': limit,
+            'offset': offset,
+            'distinct': distinct,
+            'group': group,
+            'order': tuple(order) if isinstance(order, list) else order,
+            'use_index': tuple(use_index) if isinstance(use_index, list) else use_index,
+            'force_index': tuple(force_index) if isinstance(force_index, list) else force_index,
+            'keys': tuple(by),
+        }
+
+    def get_model_cls(self):
+        """Returns model class.
+
+        :rtype: ASQLModel
+        """
+        return self.__model_cls
+
+    def get_shape(self):
+        """Returns hashable query shape.
+
+        :rtype: tuple
+        """
+        return tuple(sorted(self.__options.items()))
+
+    def compile(self):
+        """Returns compiled query. Queries of the same shape share one compiled query.
+
+        :rtype: CompiledSQLQuery
+        """
+        key = (self.__model_cls, self.__model_cls.get_read_adapter(), self.get_shape())
+
+        with self.__compiled_lock:
+            compiled = self.__compiled.get(key)
+            if compiled is not None:
+                self.__compiled.move_to_end(key)
+                return compiled
+
+        template, keys = self.__model_cls.get_read_adapter_inst().compile_read(self.__model_cls, **self.__options)
+        compiled = CompiledSQLQuery(self.__model_cls, template, keys, self.__options['select'] is None)
+
+        with self.__compiled_lock:
+            self.__compiled[key] = compiled
+            while len(self.__compiled) > self.compiled_cache_size:
+                self.__compiled.popitem(False)
+
+        return compiled
+
+    @classmethod
+    def clear_compiled(cls):
+        """Removes all compiled queries.
+
+        :rtype: None
+        """
+        with cls.__compiled_lock:
+            cls.__compiled.clear()
+
+
+class SQLQuerySet(object):
+    """Lazy chainable find query of sql model:
+
+        projects = Project.where('project.created > :since', {'since': since}, status='open').order('id DESC').limit(10)
+
+    Every chained call returns new query set. The query is executed only when the set is iterated, sliced or
+    its length is taken, found models are kept by the set and reused afterwards.
+    count(), exists() and pluck() read plain rows and don't build models.
+    """
+
+    __max_limit = 18446744073709551615
+    "MySQL maximum number of rows, used as LIMIT of slices without end."
+
+    def __init__(self, model_cls):
+        """Constructor.
+
+        :param model_cls: PyAR sql model class.
+        :type model_cls: ASQLModel
+        """
+        self.__model_cls = model_cls
+        self.__options = {
+            'select': None,
+            'joins': [],
+            'where': [],
+            'having': None,
+            'limit': None,
+            'offset': None,
+            'distinct': False,
+            'group': None,
+            'order': [],
+            'use_index': None,
+            'force_index': None,
+        }
+        self.__filters = dict()
+        self.__params = dict()
+        self.__preload = []
+        self.__result = None
+
+    def __clone(self, **options):
+        """Returns copy of this query set with the given options replaced. Found models aren't copied.
+
+        :rtype: SQLQuerySet
+        """
+        clone = self.__class__(self.__model_cls)
+        clone.__options = dict(self.__options, **options)
+        clone.__filters = dict(self.__filters)
+        clone.__params = dict(self.__params)
+        clone.__preload = list(self.__preload)
+        return clone
+
+    def get_model_cls(self):
+        """Returns model class.
+
+        :rtype: ASQLModel
+        """
+        return self.__model_cls
+
+    def where(self, condition=None, params=None, **kwargs):
+        """Adds condition. Conditions of chained calls are joined with AND statement.
+
+        :param condition: Condition with ":key" placeholders.
+        :type condition: str
+        :param params: Values of condition placeholders.
+        :type params: dict
+        :param kwargs: Fields compared for equality with the given values.
+        :type kwargs: dict
+        :rtype: SQLQuerySet
+        """
+        clone = self.__clone()
+
+        if condition is not None:
+            clone.__options['where'] = self.__options['where'] + ['(%s)' % condition]
+
+        clone.__params.update(params or dict())
+        clone.__filters.update(kwargs)
+        return clone
+
+    def params(self, **kwargs):
+        """Sets values of ":key" placeholders.
+
+        :rtype: SQLQuerySet
+        """
+        clone = self.__clone()
+        clone.__params.update(kwargs)
+        return clone
+
+    def select(self, select):
+        """Replaces SELECT-part of the SQL statement. Identity map isn't used for partial rows.
+
+        :param select: Query fields.
+        :type select: str
+        :rtype: SQLQuerySet
+        """
+        return self.__clone(select=select)
+
+    def joins(self, joins):
+        """Adds JOIN-part of the SQL statement.
+
+        :param joins: Sql joins.
+        :type joins: str
+        :rtype: SQLQuerySet
+        """
+        return self.__clone(joins=self.__options['joins'] + [joins])
+
+    def order(self, *order):
+        """Adds ORDER BY expressions.
+
+        :rtype: SQLQuerySet
+        """
+        return self.__clone(order=self.__options['order'] + list(order))
+
+    def limit(self, limit):
+        """Sets LIMIT-part of the SQL statement.
+
+        :param limit: Number of records.
+        :type limit: int
+        :rtype: SQLQuerySet
+        """
+        return self.__clone(limit=limit)
+
+    def offset(self, offset):
+        """Sets OFFSET-part of the SQL statement.
+
+        :param offset: Position of the beginning rows.
+        :type offset: int
+        :rtype: SQLQuerySet
+        """
+        return self.__clone(offset=offset)
+
+    def distinct(self, distinct=True):
+        """Sets DISTINCT-part of the SQL statement.
+
+        :type distinct: bool
+        :rtype: SQLQuerySet
+        """
+        return self.__clone(distinct=distinct)
+
+    def group(self, group, having=None):
+        """Sets "GROUP BY" and HAVING parts of the SQL statement.
+
+        :param group: Grouping expression.
+        :type group: str
+        :param having: Group conditions.
+        :type having: str
+        :rtype: SQLQuerySet
+        """
+        return self.__clone(group=group, having=having)
+
+    def use_index(self, *indexes):
+        """Sets "USE INDEX" hint.
+
+        :rtype: SQLQuerySet
+        """
+        return self.__clone(use_index=list(indexes))
+
+    def force_index(self, *indexes):
+        """Sets "FORCE INDEX" hint.
+
+        :rtype: SQLQuerySet
+        """
+        return self.__clone(force_index=list(indexes))
+
+    def preload(self, *relations):
+        """Adds relations loaded for all found models at once.
+
+        :rtype: SQLQuerySet
+        """
+        clone = self.__clone()
+        clone.__preload += list(relations)
+        return clone
+
+    def __find_kwargs(self, **options):
+        """Returns arguments of find.
+
+        :rtype: dict
+        """
+        options = dict(self.__options, **options)
+        kwargs = dict(self.__filters)
+        kwargs.update(
+            select=options['select'],
+            joins=' '.join(options['joins']) if len(options['joins']) else None,
+            where=' AND '.join(options['where']) if len(options['where']) else None,
+            having=options['having'],
+            limit=options['limit'],
+            offset=options['offset'],
+            distinct=options['distinct'],
+            group=options['group'],
+            order=options['order'] if len(options['order']) else None,
+            params=self.__params,
+            use_index=options['use_index'],
+            force_index=options['force_index'],
+        )
+        return kwargs
+
+    def __read_rows(self, query, cursor_type=None):
+        """Executes query built by the read adapter and returns plain rows.
+
+        :param query: Query string.
+        :type query: str
+        :param cursor_type: Cursor class.
+        :type cursor_type: type
+        :rtype: list
+        """
+        adapter = self.__model_cls.get_read_adapter_inst()
+        rows = adapter.read_rows(query, dict(self.__params, **self.__filters), cursor_type)
+        self.__model_cls._set_find_result(adapter, [])
+        return rows
+
+    def __build_query(self, **options):
+        """Builds SQL query with the read adapter.
+
+        :rtype: str
+        """
+        kwargs = self.__find_kwargs(**options)
+        del kwargs['params']
+
+        for key in self.__filters:
+            del kwargs[key]
+
+        return self.__model_cls.get_read_adapter_inst().build_read_query(self.__model_cls, keys=self.__filters.keys(),
+                                                                         **kwargs)
+
+    def all(self):
+        """Executes query once and returns list of found models.
+
+        :rtype: list
+        """
+        if self.__result is None:
+            self.__result = self.__model_cls.find(preload=self.__preload or None, **self.__find_kwargs())
+
+        return self.__result
+
+    def first(self):
+        """Returns first found model or None.
+
+        :rtype: ASQLModel|None
+        """
+        if self.__result is not None:
+            return self.__result[0] if len(self.__result) else None
+
+        result = self.limit(1).all()
+        return result[0] if len(result) else None
+
+    def count(self):
+        """Returns number of found rows without building models.
+        Counts of several rows are summed, so counts of all shards of ShardedAdapter are added up.
+
+        :rtype: int
+        """
+        if self.__result is not None:
+            return len(self.__result)
+
+        options = self.__options
+
+        if options['group'] is not None or options['limit'] is not None or options['offset'] is not None \
+                or options['distinct']:
+            query = 'SELECT COUNT(*) FROM (%s) AS pyar_count' % self.__build_query(order=[])
+        else:
+            query = self.__build_query(select='COUNT(*)', order=[])
+
+        return sum(int(row[0]) for row in self.__read_rows(query))
+
+    def exists(self):
+        """Returns whether at least one row is found without building models.
+
+        :rtype: bool
+        """
+        if self.__result is not None:
+            return len(self.__result) > 0
+
+        if self.__options['having'] is not None:
+            query = self.__build_query(order=[], limit=1)
+        else:
+            query = self.__build_query(select='1', order=[], limit=1)
+
+        return len(self.__read_rows(query)) > 0
+
+    def pluck(self, column):
+        """Returns list of column values without building models.
+
+        :param column: Column name or expression.
+        :type column: str
+        :rtype: list
+        """
+        return self.values_list(column, flat=True)
+
+    def values(self, *columns):
+        """Returns rows as dicts without building models. All columns of the model's table by default.
+
+        :param columns: Column names or expressions.
+        :type columns: list
+        :rtype: list
+        """
+        select = ', '.join(columns) if len(columns) else self.__options['select']
+        return self.__read_rows(self.__build_query(select=select), pymysql.cursors.DictCursor)
+
+    def values_list(self, *columns, flat=False):
+        """Returns rows as tuples without building models.
+
+        :param columns: Column names or expressions.
+        :type columns: list
+        :param flat: Returns list of values of the single column instead of tuples.
+        :type flat: bool
+        :rtype: list
+        """
+        if flat and len(columns) != 1:
+            raise SQLAdapterExecuteException('Flat values list requires exactly one column.')
+
+        select = ', '.join(columns) if len(columns) else self.__options['select']
+        rows = self.__read_rows(self.__build_query(select=select))
+        return [row[0] for row in rows] if flat else rows
+
+    def __iter__(self):
+        """Iterates found models.
+
+        :rtype: iterator
+        """
+        return iter(self.all())
+
+    def __len__(self):
+        """Returns number of found models.
+
+        :rtype: int
+        """
+        return len(self.all())
+
+    def __bool__(self):
+        """Returns whether some model is found.
+
+        :rtype: bool
+        """
+        return self.exists()
+
+    def __getitem__(self, key):
+        """Returns model by index or list of models by slice. Not found models are read with LIMIT and OFFSET.
+
+        :param key: Index or slice without step.
+        :type key: int|slice
+        :rtype: ASQLModel|list
+        """
+        if self.__result is not None:
+            return self.__result[key]
+
+        if isinstance(key, slice):
+            if key.step is not None or (key.start or 0) < 0 or (key.stop is not None and key.stop < 0):
+                raise IndexError('Negative indexes and steps are not supported by not executed query set.')
+            start = key.start or 0
+            stop = key.stop
+        else:
+            if key < 0:
+                raise IndexError('Negative indexes are not supported by not executed query set.')
+            start = key
+            stop = key + 1
+
+        offset = (self.__options['offset'] or 0) + start
+        limit = self.__options['limit']
+
+        if stop is not None:
+            limit = max(0, stop - start) if limit is None else max(0, min(limit - start, stop - start))
+        elif limit is not None:
+            limit = max(0, limit - start)
+
+        result = self.__clone(limit=limit if limit is not None else self.__max_limit,
+                              offset=offset if offset else None).all()
+
+        if isinstance(key, slice):
+            return result
+
+        if not len(result):
+            raise IndexError('Query set index out of range.')
+
+        return result[0]
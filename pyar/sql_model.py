@@ -16,9 +16,18 @@
 """
 
 
+import base64
+import collections
+import json
+import threading
+import weakref
+
 from .model import AModel
-from .exception import RelationFieldNotExistsException, SQLAdapterExecuteException
+from .async_adapter import AsyncIAdapter
+from .exception import RelationFieldNotExistsException, SQLAdapterExecuteException, PaginationCursorException
 from .base import PyAR
+from .identity_map import IdentityMap
+from .query import SQLQuery, SQLQuerySet
 
 
 class ASQLModelLastData(AModel):
@@ -74,7 +83,7 @@ class ASQLModelFinder(ASQLModelPK):
 
     @classmethod
     def find(cls, select=None, joins=None, where=None, having=None, limit=None, offset=None, distinct=False, group=None,
-             order=None, params=dict(), **kwargs):
+             order=None, params=dict(), use_index=None, force_index=None, preload=None, raw=False, **kwargs):
         """Find entities and returns it as list of models.
 
         :param select: Allows to specify query field. Representing the SELECT-part of the SQL statement.
@@ -96,10 +105,20 @@ class ASQLModelFinder(ASQLModelPK):
         :param group: Allows to specify grouping of result. Representing the "GROUP BY"-part of the SQL statement.
         :type group: str
         :param order: Allows to specify ordering of result. Representing the "ORDER BY"-part of the SQL statement.
-        :type order: str
+        List items are joined as multi-column ordering.
+        :type order: str|list
         :param params: Allows to specify query parameters.
         In other words it replaces every ":key" of builded query by value.
         :type params: dict
+        :param use_index: Index name or list of names the server should choose from. Adds "USE INDEX" hint.
+        :type use_index: str|list
+        :param force_index: Index name or list of names the server must use. Adds "FORCE INDEX" hint.
+        :type force_index: str|list
+        :param preload: Relation names loaded for all found models at once, nested relations are separated by dot.
+        :type preload: list
+        :param raw: Returns rows as dicts (True or "dict") or tuples ("tuple") instead of models.
+        Rows skip model construction, identity map and preloading.
+        :type raw: bool|str
         :param kwargs: Allows to specify query conditions with AND statement.
         Representing the WHERE-part of the SQL statement.
         :type kwargs: dict
@@ -115,15 +134,180 @@ class ASQLModelFinder(ASQLModelPK):
         kwargs['group'] = group
         kwargs['order'] = order
         kwargs['params'] = params
+        kwargs['use_index'] = use_index
+        kwargs['force_index'] = force_index
+
+        if raw:
+            result = super().find(raw=raw, **kwargs)
+            return cls._set_find_result(cls.get_read_adapter_inst(), result, False)
+
+        result = cls._set_find_result(cls.get_read_adapter_inst(), super().find(**kwargs),
+                                      select is None and kwargs.get('query') is None)
+
+        if preload is not None and isinstance(result, list):
+            Relation.preload_models(result, preload)
 
-        result = super().find(**kwargs)
-        cls._last_query = cls.get_read_adapter_inst().get_last_query()
-        cls._last_result = cls.get_read_adapter_inst().get_last_result()
         return result
 
+    @classmethod
+    async def afind(cls, preload=None, **kwargs):
+        """Coroutine of find. Takes the same arguments as find.
+        Preloading isn't supported by asynchronous adapters.
+
+        :rtype: list
+        """
+        adapter = cls.get_read_adapter_inst()
+
+        if not isinstance(adapter, AsyncIAdapter):
+            return await super().afind(preload=preload, **kwargs)
+
+        if preload is not None:
+            raise SQLAdapterExecuteException('Preloading is not supported by asynchronous adapters.')
+
+        result = await adapter.read(cls, **kwargs)
+        return cls._set_find_result(adapter, result, not kwargs.get('raw') and kwargs.get('select') is None
+                                    and kwargs.get('query') is None)
+
+    @classmethod
+    async def afind_one(cls, **kwargs):
+        """Coroutine of find_one. Takes the same arguments as find_one.
+
+        :rtype: ASQLModel|None
+        """
+        kwargs['limit'] = 1
+        result = await cls.afind(**kwargs)
+        return result[0] if len(result) else None
+
+    @classmethod
+    def _set_find_result(cls, adapter, result, full_rows=True):
+        """Stores last query and result of the adapter and replaces models by the ones of active identity map.
+        Streamed query is executed by the first iteration, so its query and result are stored then.
+
+        :param adapter: Read adapter.
+        :type adapter: MySQLAdapter
+        :param result: Found models.
+        :type result: list|iterator
+        :param full_rows: Shows whether models contain all columns of their rows.
+        :type full_rows: bool
+        :rtype: list|iterator
+        """
+        identity_map = IdentityMap.get_current() if full_rows else None
+
+        if not isinstance(result, list):
+            return cls.__stream_find_result(adapter, result, identity_map)
+
+        cls._last_query = adapter.get_last_query()
+        cls._last_result = adapter.get_last_result()
+
+        if identity_map is not None:
+            result = [identity_map.add(model) for model in result]
+
+        return result
+
+    @classmethod
+    def __stream_find_result(cls, adapter, result, identity_map):
+        """Yields streamed models. Stores last query and result of the adapter once the query is executed.
+
+        :param adapter: Read adapter.
+        :type adapter: MySQLAdapter
+        :param result: Found models.
+        :type result: iterator
+        :param identity_map: Active identity map or None.
+        :type identity_map: IdentityMap
+        :rtype: iterator
+        """
+        executed = False
+
+        for model in result:
+            if not executed:
+                cls._last_query = adapter.get_last_query()
+                cls._last_result = adapter.get_last_result()
+                executed = True
+            yield model if identity_map is None else identity_map.add(model)
+
+        if not executed:
+            cls._last_query = adapter.get_last_query()
+            cls._last_result = adapter.get_last_result()
+
+    @classmethod
+    def query(cls, select=None, joins=None, where=None, having=None, limit=None, offset=None, distinct=False,
+              group=None, order=None, use_index=None, force_index=None, by=()):
+        """Returns query of the given shape. Its compile() returns reusable query which only binds parameters:
+
+            Project.query(where='project.owner_id = :owner_id', order='id').compile().fetch(owner_id=1)
+
+        :param by: Names of fields compared for equality with parameters of the same name.
+        :type by: list
+        :rtype: SQLQuery
+        """
+        return SQLQuery(cls, select=select, joins=joins, where=where, having=having, limit=limit, offset=offset,
+                        distinct=distinct, group=group, order=order, use_index=use_index, force_index=force_index,
+                        by=by)
+
+    @classmethod
+    def values_list(cls, *columns, flat=False, **kwargs):
+        """Returns tuples of the given columns without building models.
+        Takes the same arguments as find except select.
+
+            Project.values_list('id', 'title', where='project.created > :since', params={'since': since})
+            Project.values_list('id', flat=True, status='open')
+
+        :param columns: Column names or expressions.
+        :type columns: list
+        :param flat: Returns list of values of the single column instead of tuples.
+        :type flat: bool
+        :rtype: list|iterator
+        """
+        if flat and len(columns) != 1:
+            raise SQLAdapterExecuteException('Flat values list requires exactly one column.')
+
+        result = cls.find(select=', '.join(columns), raw='tuple', **kwargs)
+
+        if not flat:
+            return result
+
+        if isinstance(result, list):
+            return [row[0] for row in result]
+
+        return (row[0] for row in result)
+
+    @classmethod
+    def queryset(cls):
+        """Returns lazy query set of all entities.
+
+        :rtype: SQLQuerySet
+        """
+        return SQLQuerySet(cls)
+
+    @classmethod
+    def where(cls, condition=None, params=None, **kwargs):
+        """Returns lazy query set of entities matching the condition. See SQLQuerySet.where.
+
+        :param condition: Condition with ":key" placeholders.
+        :type condition: str
+        :param params: Values of condition placeholders.
+        :type params: dict
+        :param kwargs: Fields compared for equality with the given values.
+        :type kwargs: dict
+        :rtype: SQLQuerySet
+        """
+        return SQLQuerySet(cls).where(condition, params, **kwargs)
+
+    @classmethod
+    def iter_find(cls, chunk_size=1000, **kwargs):
+        """Find entities and yields them one by one.
+        Rows are read with unbuffered cursor, so memory usage stays flat for any number of rows.
+        Takes the same arguments as find.
+
+        :param chunk_size: Number of rows fetched at once.
+        :type chunk_size: int
+        :rtype: iterator
+        """
+        return cls.find(stream=True, chunk_size=chunk_size, **kwargs)
+
     @classmethod
     def count(cls, joins=None, where=None, having=None, distinct=False, group=None,
-              order=None, params=dict(), **kwargs):
+              order=None, params=dict(), use_index=None, force_index=None, **kwargs):
         """Find entities and returns it as list of models.
 
         :param joins: Allows to specify row sql joins. Representing the JOIN-part of the SQL statement.
@@ -138,31 +322,38 @@ class ASQLModelFinder(ASQLModelPK):
         :param group: Allows to specify grouping of result. Representing the "GROUP BY"-part of the SQL statement.
         :type group: str
         :param order: Allows to specify ordering of result. Representing the "ORDER BY"-part of the SQL statement.
-        :type order: str
+        List items are joined as multi-column ordering. Ignored, since it doesn't change the count.
+        :type order: str|list
         :param params: Allows to specify query parameters.
         In other words it replaces every ":key" of builded query by value.
         :type params: dict
+        :param use_index: Index name or list of names the server should choose from. Adds "USE INDEX" hint.
+        :type use_index: str|list
+        :param force_index: Index name or list of names the server must use. Adds "FORCE INDEX" hint.
+        :type force_index: str|list
         :param kwargs: Allows to specify query conditions with AND statement.
         Representing the WHERE-part of the SQL statement.
         :type kwargs: dict
         :rtype: int
         """
-        kwargs['select'] = 'COUNT(*) AS count_rows'
-        kwargs['joins'] = joins
-        kwargs['where'] = where
-        kwargs['having'] = having
-        kwargs['limit'] = 1
-        kwargs['distinct'] = distinct
-        kwargs['group'] = group
-        kwargs['order'] = order
-        kwargs['params'] = params
+        adapter = cls.get_read_adapter_inst()
+        options = dict(joins=joins, where=where, having=having, distinct=distinct, group=group, use_index=use_index,
+                       force_index=force_index, keys=kwargs.keys())
+
+        if group is not None or distinct:
+            select = None if distinct else '1'
+            query = 'SELECT COUNT(*) FROM (%s) AS pyar_count' % adapter.build_read_query(cls, select=select, **options)
+        else:
+            query = adapter.build_read_query(cls, select='COUNT(*)', **options)
 
-        model = cls.find_one(**kwargs)
-        return model.count_rows if model is not None else 0
+        # Counts of several rows are summed, so counts of all shards of ShardedAdapter are added up.
+        rows = adapter.read_rows(query, dict(params, **kwargs))
+        cls._set_find_result(adapter, [])
+        return sum(int(row[0]) for row in rows)
 
     @classmethod
     def find_one(cls, select=None, joins=None, where=None, having=None, offset=None, distinct=False, group=None,
-                 order=None, params=dict(), **kwargs):
+                 order=None, params=dict(), use_index=None, force_index=None, **kwargs):
         """Find entities and returns it as list of models.
 
         :param select: Allows to specify query field. Representing the SELECT-part of the SQL statement.
@@ -182,10 +373,15 @@ class ASQLModelFinder(ASQLModelPK):
         :param group: Allows to specify grouping of result. Representing the "GROUP BY"-part of the SQL statement.
         :type group: str
         :param order: Allows to specify ordering of result. Representing the "ORDER BY"-part of the SQL statement.
-        :type order: str
+        List items are joined as multi-column ordering.
+        :type order: str|list
         :param params: Allows to specify query parameters.
         In other words it replaces every ":key" of builded query by value.
         :type params: dict
+        :param use_index: Index name or list of names the server should choose from. Adds "USE INDEX" hint.
+        :type use_index: str|list
+        :param force_index: Index name or list of names the server must use. Adds "FORCE INDEX" hint.
+        :type force_index: str|list
         :param kwargs: Allows to specify query conditions with AND statement.
         Representing the WHERE-part of the SQL statement.
         :type kwargs: dict
@@ -201,6 +397,8 @@ class ASQLModelFinder(ASQLModelPK):
         kwargs['group'] = group
         kwargs['order'] = order
         kwargs['params'] = params
+        kwargs['use_index'] = use_index
+        kwargs['force_index'] = force_index
 
         result = super().find_one(**kwargs)
         cls._last_query = cls.get_read_adapter_inst().get_last_query()
@@ -215,7 +413,14 @@ class ASQLModelFinder(ASQLModelPK):
         :type id: int|str
         :rtype: ASQLModel
         """
-        return cls.find_one(**{cls.get_pk(): str(id)})
+        identity_map = IdentityMap.get_current()
+
+        if identity_map is not None:
+            model = identity_map.get(cls, id)
+            if model is not None:
+                return model
+
+        return cls.find_one(**{cls.get_pk(): id})
 
     @classmethod
     def find_by_query(cls, query, params=dict(), **kwargs):
@@ -230,6 +435,153 @@ class ASQLModelFinder(ASQLModelPK):
         """
         return cls.find(query=query, params=params, **kwargs)
 
+    @classmethod
+    def paginate(cls, order_by=None, page_size=100, after=None, where=None, params=dict(), **kwargs):
+        """Returns one page of models using keyset (seek) pagination
+        and continuation cursor of the next page, which is None for the last page.
+        Sort columns must not contain NULL values. Primary key is appended to them as tie-breaker.
+        Takes the same find arguments as find except order, limit and offset.
+
+        :param order_by: Sort column or list of sort columns, each can be followed by ASC or DESC.
+        Primary key by default.
+        :type order_by: str|list
+        :param page_size: Number of models per page.
+        :type page_size: int
+        :param after: Continuation cursor returned with the previous page.
+        :type after: str
+        :param where: Allows to specify query conditions. Representing the WHERE-part of the SQL statement.
+        :type where: str
+        :param params: Allows to specify query parameters.
+        :type params: dict
+        :rtype: tuple(list, str|None)
+        """
+        keys = cls.__get_seek_keys(order_by)
+        params = dict(params)
+        conditions = [] if where is None else ['(%s)' % where]
+
+        if after is not None:
+            conditions.append(cls.__build_seek_where(keys, cls.__decode_cursor(after, len(keys)), params))
+
+        result = cls.find(
+            where=' AND '.join(conditions) if len(conditions) else None,
+            order=', '.join(['%s %s' % (column, 'DESC' if desc else 'ASC') for column, attr, desc in keys]),
+            limit=page_size,
+            params=params,
+            **kwargs
+        )
+
+        cursor = None
+
+        if len(result) and len(result) == page_size:
+            cursor = cls.__encode_cursor([result[-1].get_attr(attr) for column, attr, desc in keys])
+
+        return result, cursor
+
+    @classmethod
+    def iter_pages(cls, order_by=None, page_size=100, after=None, **kwargs):
+        """Yields all pages of paginate as (models, cursor) pairs starting after the given cursor.
+        Takes the same arguments as paginate.
+
+        :rtype: iterator
+        """
+        while True:
+            result, after = cls.paginate(order_by=order_by, page_size=page_size, after=after, **kwargs)
+
+            if len(result):
+                yield result, after
+
+            if after is None:
+                break
+
+    @classmethod
+    def __get_seek_keys(cls, order_by):
+        """Returns list of (column, attribute, is descending) sort keys ending with primary key.
+
+        :param order_by: Sort column or list of sort columns.
+        :type order_by: str|list|None
+        :rtype: list
+        """
+        if order_by is None:
+            order_by = []
+        elif isinstance(order_by, str):
+            order_by = [item for item in order_by.split(',')]
+
+        keys = []
+
+        for item in order_by:
+            parts = item.split()
+            desc = len(parts) > 1 and parts[1].upper() == 'DESC'
+            column = parts[0] if '.' in parts[0] else '%s.%s' % (cls.get_resource(), parts[0])
+            keys.append((column, column.split('.')[-1], desc))
+
+        if cls.get_pk() not in [attr for column, attr, desc in keys]:
+            keys.append(('%s.%s' % (cls.get_resource(), cls.get_pk()), cls.get_pk(), keys[-1][2] if len(keys) else False))
+
+        return keys
+
+    @staticmethod
+    def __build_seek_where(keys, values, params):
+        """Builds condition which selects rows after the given sort key values and adds its parameters.
+
+        :param keys: List of (column, attribute, is descending) sort keys.
+        :type keys: list
+        :param values: Sort key values of the last row.
+        :type values: list
+        :param params: Query parameters.
+        :type params: dict
+        :rtype: str
+        """
+        names = []
+
+        for i, value in enumerate(values):
+            names.append(':seek_key_%d' % i)
+            params['seek_key_%d' % i] = value
+
+        if len(set([desc for column, attr, desc in keys])) == 1:
+            return '(%s) %s (%s)' % (
+                ', '.join([column for column, attr, desc in keys]),
+                '<' if keys[0][2] else '>',
+                ', '.join(names),
+            )
+
+        parts = []
+
+        for i, (column, attr, desc) in enumerate(keys):
+            equals = ['%s = %s' % (keys[j][0], names[j]) for j in range(i)]
+            parts.append('(%s)' % ' AND '.join(equals + ['%s %s %s' % (column, '<' if desc else '>', names[i])]))
+
+        return '(%s)' % ' OR '.join(parts)
+
+    @staticmethod
+    def __encode_cursor(values):
+        """Returns opaque continuation cursor of sort key values.
+
+        :param values: Sort key values.
+        :type values: list
+        :rtype: str
+        """
+        return base64.urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+    @staticmethod
+    def __decode_cursor(cursor, length):
+        """Returns sort key values of continuation cursor.
+
+        :param cursor: Continuation cursor.
+        :type cursor: str
+        :param length: Expected number of values.
+        :type length: int
+        :rtype: list
+        """
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        except (ValueError, TypeError, AttributeError):
+            raise PaginationCursorException('Invalid pagination cursor [%s].' % cursor)
+
+        if not isinstance(values, list) or len(values) != length:
+            raise PaginationCursorException('Pagination cursor [%s] doesn\'t match sort keys.' % cursor)
+
+        return values
+
 
 class ASQLModel(ASQLModelFinder):
     """PyAR abstract sql model."""
@@ -249,6 +601,43 @@ class ASQLModel(ASQLModelFinder):
 
         return ret
 
+    @classmethod
+    def get_relation(cls, name):
+        """Returns relation descriptor by name.
+
+        :param name: Relation name.
+        :type name: str
+        :rtype: Relation
+        """
+        relation = getattr(cls, name, None)
+
+        if not isinstance(relation, Relation):
+            raise RelationFieldNotExistsException('Relation [%s] not exists in [%s].' % (name, cls.__name__))
+
+        return relation
+
+    def reload_relation(self, name):
+        """Loads relation data again and returns it.
+
+        :param name: Relation name.
+        :type name: str
+        :rtype: ASQLModel|list<ASQLModel>
+        """
+        return self.get_relation(name).reload(self)
+
+    def invalidate_relations(self, *names):
+        """Removes cached data of the given relations or of all relations of this model.
+
+        :param names: Relation names.
+        :type names: str
+        :rtype: None
+        """
+        if not len(names):
+            names = [name for name in dir(self.__class__) if isinstance(getattr(self.__class__, name), Relation)]
+
+        for name in names:
+            self.get_relation(name).invalidate(self)
+
     def save(self, transactional=False, with_relations=False):
         """Saves model.
 
@@ -272,10 +661,11 @@ class ASQLModel(ASQLModelFinder):
         try:
             super().create()
             self.set_is_new(False)
-            setattr(self, self.get_pk(), self.get_write_adapter_inst().get_last_result().lastrowid)
+            if self.get_id() is None:
+                setattr(self, self.get_pk(), self.get_write_adapter_inst().get_last_result().lastrowid)
             last_query.append(self.get_write_adapter_inst().get_last_query())
             self.__class__._last_result = self.get_write_adapter_inst().get_last_result()
-        except SQLAdapterExecuteException as exc:
+        except Exception as exc:
             self.__class__._last_result = self.get_write_adapter_inst().get_last_result()
             last_query.append(self.get_write_adapter_inst().get_last_query())
 
@@ -291,6 +681,11 @@ class ASQLModel(ASQLModelFinder):
             last_query.append(self.get_write_adapter_inst().get_last_query())
 
         self.__class__._last_query = '; '.join(last_query)
+        self.mark_clean()
+
+        if IdentityMap.get_current() is not None:
+            IdentityMap.get_current().add(self)
+
         return True
 
     def update(self, transactional=True, with_relations=False, **kwargs):
@@ -301,6 +696,9 @@ class ASQLModel(ASQLModelFinder):
         :param with_relations: Update relation_model models flag.
         :rtype: bool
         """
+        if not self.is_dirty() and not with_relations:
+            return True
+
         last_query = []
 
         if transactional:
@@ -308,15 +706,15 @@ class ASQLModel(ASQLModelFinder):
             last_query.append(self.get_write_adapter_inst().get_last_query())
 
         try:
-            super().update()
-            last_query.append(self.get_write_adapter_inst().get_last_query())
-            self.__class__._last_result = self.get_write_adapter_inst().get_last_result()
+            if super().update():
+                last_query.append(self.get_write_adapter_inst().get_last_query())
+                self.__class__._last_result = self.get_write_adapter_inst().get_last_result()
 
             if with_relations:
                 for key, relation_model in self.get_data_models().items():
                     relation_model.update(transactional=False, with_relations=True)
                     last_query.append(relation_model.get_last_query())
-        except SQLAdapterExecuteException as exc:
+        except Exception as exc:
             self.__class__._last_result = self.get_write_adapter_inst().get_last_result()
             last_query.append(self.get_write_adapter_inst().get_last_query())
 
@@ -332,6 +730,7 @@ class ASQLModel(ASQLModelFinder):
             last_query.append(self.get_write_adapter_inst().get_last_query())
 
         self.__class__._last_query = '; '.join(last_query)
+        self.mark_clean()
         return True
 
     def delete(self):
@@ -339,20 +738,387 @@ class ASQLModel(ASQLModelFinder):
 
         :rtype: bool
         """
-        super().delete()
-        self.__class__._last_query = self.get_write_adapter_inst().get_last_query()
-        self.get_write_adapter_inst().commit_transaction()
+        adapter = self.get_write_adapter_inst()
+
+        try:
+            super().delete()
+        except Exception as exc:
+            self.__class__._last_query = adapter.get_last_query()
+            if adapter.in_transaction():
+                adapter.rollback_transaction()
+            raise exc
+
+        self.__class__._last_query = adapter.get_last_query()
+        if adapter.in_transaction():
+            adapter.commit_transaction()
+
+        if IdentityMap.get_current() is not None:
+            IdentityMap.get_current().remove(self)
+
         self.set_is_new(True)
         self.del_attr(self.get_pk())
         return True
 
+    async def asave(self, transactional=False, with_relations=False):
+        """Coroutine of save.
+
+        :rtype: bool
+        """
+        return await super().asave(transactional=transactional, with_relations=with_relations)
+
+    async def acreate(self, transactional=True, **kwargs):
+        """Coroutine of create.
+
+        :param transactional: Create transactional flag.
+        :type transactional: bool
+        :rtype: bool
+        """
+        adapter = self.get_write_adapter_inst()
+
+        if not isinstance(adapter, AsyncIAdapter):
+            return await super().acreate(transactional=transactional, **kwargs)
+
+        if transactional:
+            await adapter.start_transaction()
+
+        try:
+            await adapter.create(self)
+            self.set_is_new(False)
+            if self.get_id() is None:
+                setattr(self, self.get_pk(), adapter.get_last_result().lastrowid)
+        except Exception as exc:
+            if transactional:
+                await adapter.rollback_transaction()
+            self.__class__._last_result = adapter.get_last_result()
+            self.__class__._last_query = adapter.get_last_query()
+            raise exc
+
+        self.__class__._last_result = adapter.get_last_result()
+        self.__class__._last_query = adapter.get_last_query()
+
+        if transactional:
+            await adapter.commit_transaction()
+
+        self.mark_clean()
+
+        if IdentityMap.get_current() is not None:
+            IdentityMap.get_current().add(self)
+
+        return True
+
+    async def aupdate(self, transactional=True, with_relations=False, **kwargs):
+        """Coroutine of update. Relations aren't loaded by asynchronous adapters, so with_relations
+        is supported by synchronous adapters only.
+
+        :param transactional: Update transactional flag.
+        :type transactional: bool
+        :param with_relations: Update relation_model models flag.
+        :rtype: bool
+        """
+        adapter = self.get_write_adapter_inst()
+
+        if not isinstance(adapter, AsyncIAdapter):
+            return await super().aupdate(transactional=transactional, with_relations=with_relations, **kwargs)
+
+        if with_relations:
+            raise SQLAdapterExecuteException('Relations are not supported by asynchronous adapters.')
+
+        if not self.is_dirty():
+            return True
+
+        if transactional:
+            await adapter.start_transaction()
+
+        try:
+            if await adapter.update(self):
+                self.__class__._last_result = adapter.get_last_result()
+                self.__class__._last_query = adapter.get_last_query()
+        except Exception as exc:
+            if transactional:
+                await adapter.rollback_transaction()
+            raise exc
+
+        if transactional:
+            await adapter.commit_transaction()
+
+        self.mark_clean()
+        return True
+
+    async def adelete(self):
+        """Coroutine of delete.
+
+        :rtype: bool
+        """
+        adapter = self.get_write_adapter_inst()
+
+        if not isinstance(adapter, AsyncIAdapter):
+            return await super().adelete()
+
+        await adapter.delete(self)
+        self.__class__._last_query = adapter.get_last_query()
+
+        if IdentityMap.get_current() is not None:
+            IdentityMap.get_current().remove(self)
+
+        self.set_is_new(True)
+        self.del_attr(self.get_pk())
+        return True
+
+    @classmethod
+    def bulk_create(cls, models, batch_size=1000, transactional=True):
+        """Creates models with multi-row INSERT statements.
+
+        :param models: Models to create.
+        :type models: list<ASQLModel>
+        :param batch_size: Maximum number of rows per statement.
+        :type batch_size: int
+        :param transactional: Create transactional flag.
+        :type transactional: bool
+        :rtype: bool
+        """
+        models = list(models)
+        state = cls.__get_state(models)
+
+        try:
+            cls._transaction(lambda adapter: adapter.bulk_create(cls, models, batch_size), transactional)
+        except Exception as exc:
+            cls.__restore_state(state)
+            raise exc
+
+        identity_map = IdentityMap.get_current()
+
+        for model in models:
+            model.mark_clean()
+            if identity_map is not None:
+                identity_map.add(model)
+
+        return True
+
+    @classmethod
+    def bulk_update(cls, models, fields=None, batch_size=1000, transactional=True):
+        """Updates models with batched "CASE pk WHEN ..." statements.
+
+        :param models: Models to update.
+        :type models: list<ASQLModel>
+        :param fields: Fields to update. All fields of the models by default.
+        :type fields: list
+        :param batch_size: Maximum number of rows per statement.
+        :type batch_size: int
+        :param transactional: Update transactional flag.
+        :type transactional: bool
+        :rtype: bool
+        """
+        models = list(models)
+        cls._transaction(lambda adapter: adapter.bulk_update(cls, models, fields, batch_size), transactional)
+
+        for model in models:
+            model.mark_clean(fields)
+
+        return True
+
+    @classmethod
+    def bulk_upsert(cls, models, fields=None, batch_size=1000, transactional=True):
+        """Creates models or updates existing rows with "INSERT ... ON DUPLICATE KEY UPDATE" statements.
+
+        :param models: Models to create or update.
+        :type models: list<ASQLModel>
+        :param fields: Fields to update on duplicate key. All inserted fields except primary key by default.
+        :type fields: list
+        :param batch_size: Maximum number of rows per statement.
+        :type batch_size: int
+        :param transactional: Upsert transactional flag.
+        :type transactional: bool
+        :rtype: bool
+        """
+        models = list(models)
+        state = cls.__get_state(models)
+
+        try:
+            cls._transaction(lambda adapter: adapter.bulk_upsert(cls, models, fields, batch_size), transactional)
+        except Exception as exc:
+            cls.__restore_state(state)
+            raise exc
+
+        for model in models:
+            model.mark_clean()
+
+        return True
+
+    @classmethod
+    def __get_state(cls, models):
+        """Returns new flags and primary keys of models, which bulk methods change.
+
+        :param models: Models.
+        :type models: list<ASQLModel>
+        :rtype: list<tuple>
+        """
+        return [(model, model.is_new(), model.get_id()) for model in models]
+
+    @classmethod
+    def __restore_state(cls, state):
+        """Restores new flags of models and removes primary keys assigned by failed bulk method.
+
+        :param state: Result of __get_state.
+        :type state: list<tuple>
+        :rtype: None
+        """
+        for model, is_new, id in state:
+            model.set_is_new(is_new)
+            if id is None and model.get_id() is not None:
+                model.del_attr(cls.get_pk())
+
+    @classmethod
+    def _transaction(cls, callback, transactional=True):
+        """Calls callback with write adapter, optionally inside of transaction,
+        and stores last query and result of the model.
+
+        :param callback: Function which takes write adapter.
+        :type callback: callable
+        :param transactional: Transactional flag.
+        :type transactional: bool
+        :rtype: mixed
+        """
+        adapter = cls.get_write_adapter_inst()
+        last_query = []
+
+        if transactional:
+            adapter.start_transaction()
+            last_query.append(adapter.get_last_query())
+
+        try:
+            result = callback(adapter)
+            last_query.append(adapter.get_last_query())
+            cls._last_result = adapter.get_last_result()
+        except Exception as exc:
+            cls._last_result = adapter.get_last_result()
+            last_query.append(adapter.get_last_query())
+
+            if transactional:
+                adapter.rollback_transaction()
+                last_query.append(adapter.get_last_query())
+
+            cls._last_query = '; '.join(last_query)
+            raise exc
+
+        if transactional:
+            adapter.commit_transaction()
+            last_query.append(adapter.get_last_query())
+
+        cls._last_query = '; '.join(last_query)
+        return result
+
+
+class RelationCache(object):
+    """Relation data cache keyed by parent model.
+    Holds weak references to parent models, so entries disappear together with them,
+    and evicts least recently used entries when the size limit is reached.
+    """
+
+    def __init__(self, size=None):
+        """Constructor.
+
+        :param size: Maximum number of entries. None means unlimited, 0 disables caching.
+        :type size: int
+        """
+        self.__size = size
+        self.__entries = collections.OrderedDict()
+        self.__lock = threading.RLock()
+
+    def get(self, model, relation_value):
+        """Returns (found, data) pair.
+        Entry is found only if it was stored for the same relation value of the model.
+
+        :param model: Parent model.
+        :type model: ASQLModel
+        :param relation_value: Current relation value of the parent model.
+        :type relation_value: mixed
+        :rtype: tuple
+        """
+        with self.__lock:
+            entry = self.__entries.get(id(model))
+
+            if entry is None or entry[0]() is not model or entry[1] != relation_value:
+                return False, None
+
+            self.__entries.move_to_end(id(model))
+            return True, entry[2]
+
+    def set(self, model, relation_value, data):
+        """Stores relation data of the parent model.
+
+        :param model: Parent model.
+        :type model: ASQLModel
+        :param relation_value: Relation value the data was loaded for.
+        :type relation_value: mixed
+        :param data: Relation data.
+        :type data: ASQLModel|list<ASQLModel>
+        :rtype: None
+        """
+        if self.__size == 0:
+            return
+
+        key = id(model)
+        ref = weakref.ref(model, lambda item: self.__discard(key, item))
+
+        with self.__lock:
+            self.__entries[key] = (ref, relation_value, data)
+            self.__entries.move_to_end(key)
+
+            while self.__size is not None and len(self.__entries) > self.__size:
+                self.__entries.popitem(False)
+
+    def remove(self, model):
+        """Removes relation data of the parent model.
+
+        :param model: Parent model.
+        :type model: ASQLModel
+        :rtype: None
+        """
+        with self.__lock:
+            self.__entries.pop(id(model), None)
+
+    def clear(self):
+        """Removes all entries.
+
+        :rtype: None
+        """
+        with self.__lock:
+            self.__entries.clear()
+
+    def __discard(self, key, ref):
+        """Removes entry of garbage collected parent model.
+
+        :param key: Entry key.
+        :type key: int
+        :param ref: Weak reference of the parent model.
+        :type ref: weakref
+        :rtype: None
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] is ref:
+                del self.__entries[key]
+
+    def __len__(self):
+        """Returns number of entries.
+
+        :rtype: int
+        """
+        return len(self.__entries)
+
+
+RelationTemplate = collections.namedtuple('RelationTemplate', [
+    'relation_key', 'foreign_key', 'joins', 'where', 'column', 'through'
+])
+"Query template of relation: keys, joins and where-part, compared column and through flag."
+
 
 class Relation(property):
     """PyAR models relation class."""
 
     def __init__(self, model_cls, foreign_key=None, relation_key=None, through=None, through_relation_key=None,
                  select=None, joins=None, where=None, having=None, limit=None, offset=None, distinct=False, group=None,
-                 order=None, params=dict(), **kwargs):
+                 order=None, params=dict(), cache_size=None, **kwargs):
         """Sets relation config.
 
         :param model_cls: Foreign model.
@@ -388,6 +1154,9 @@ class Relation(property):
         :param params: Allows to specify query parameters.
         In other words it replaces every ":key" of builded query by value.
         :type params: dict
+        :param cache_size: Maximum number of parent models with cached relation data.
+        None means unlimited, 0 disables caching.
+        :type cache_size: int
         :param kwargs: Allows to specify query conditions with AND statement.
         Representing the WHERE-part of the SQL statement.
         :type kwargs: dict
@@ -406,10 +1175,12 @@ class Relation(property):
         self.distinct = distinct
         self.group = group
         self.order = order
-        self.params = params
+        self.params = dict(params)
         self.kwargs = kwargs
 
-        self.__data = dict()
+        self.__cache = RelationCache(cache_size)
+        self.__templates = dict()
+        self.__lock = threading.Lock()
 
         super().__init__(self.__get_data)
 
@@ -423,78 +1194,271 @@ class Relation(property):
             self.__model_cls = PyAR.get_model(self.__model_cls)
         return self.__model_cls
 
-    def _get_relation_value(self):
-        """Returns relation value.
+    def _get_relation_value(self, parent_model, relation_key):
+        """Returns relation value of the parent model.
 
+        :param parent_model: Relation model.
+        :type parent_model: ASQLModel
+        :param relation_key: Relation field name.
+        :type relation_key: str
         :rtype: str
         """
-        value = self.parent_model.get_attr(self.relation_key)
+        value = parent_model.get_attr(relation_key)
         if value is None:
-            raise RelationFieldNotExistsException('Relation field [%s] not exists.' % self.relation_key)
+            raise RelationFieldNotExistsException('Relation field [%s] not exists.' % relation_key)
         return value
 
-    def _prepare_filters(self):
-        """Prepares find filters.
+    def _get_template(self, parent_cls):
+        """Returns query template of the relation for the parent model class.
+        Template is built once per parent class and is never changed afterwards,
+        so loading doesn't modify the relation and is safe in concurrent threads.
+
+        :param parent_cls: Relation model class.
+        :type parent_cls: ASQLModel
+        :rtype: RelationTemplate
+        """
+        template = self.__templates.get(parent_cls)
+
+        if template is None:
+            with self.__lock:
+                template = self.__templates.get(parent_cls)
+                if template is None:
+                    template = self._build_template(parent_cls)
+                    self.__templates[parent_cls] = template
+
+        return template
 
+    def _build_template(self, parent_cls):
+        """Builds query template of the relation for the parent model class.
+
+        :param parent_cls: Relation model class.
+        :type parent_cls: ASQLModel
+        :rtype: RelationTemplate
+        """
+        relation_key, foreign_key = self._get_keys(parent_cls)
+        resource = self.model_cls.get_resource()
+
+        if self.through is None:
+            return RelationTemplate(relation_key, foreign_key, self.joins,
+                                    '' if self.where is None else '(%s) AND ' % self.where,
+                                    '%s.%s' % (resource, foreign_key), False)
+
+        through_resource = self.through.model_cls.get_resource()
+
+        joins = '' if self.joins is None else self.joins + ' '
+        joins += 'LEFT JOIN %s ON (%s.%s = %s.%s)' % (
+            through_resource,
+
+            through_resource,
+            self.through.relation_key if self.through.relation_key is not None
+            else '%s_%s' % (resource, self.model_cls.get_pk()),
+
+            resource,
+            self.through.foreign_key if self.through.foreign_key is not None else self.model_cls.get_pk(),
+        )
+
+        column = '%s.%s' % (
+            through_resource,
+            self.through.through_relation_key if self.through.through_relation_key is not None
+            else '%s_%s' % (parent_cls.get_resource(), parent_cls.get_pk()),
+        )
+
+        return RelationTemplate(relation_key, foreign_key, joins,
+                                '' if self.where is None else '(%s) AND ' % self.where, column, True)
+
+    def _get_query(self, parent_model):
+        """Returns find arguments which load relation data of the parent model.
+        Every call returns new dict built from the relation template.
+
+        :param parent_model: Relation model.
+        :type parent_model: ASQLModel
+        :rtype: dict
+        """
+        template = self._get_template(parent_model.__class__)
+        params = dict(self.params)
+        params['relation_value'] = self._get_relation_value(parent_model, template.relation_key)
+
+        query = dict(self.kwargs)
+        query.update(select=self.select, joins=template.joins, where=template.where + '%s = :relation_value' % (
+            template.column), having=self.having, offset=self.offset, distinct=self.distinct, group=self.group,
+            order=self.order, params=params)
+
+        return query
+
+    def _get_keys(self, parent_cls):
+        """Returns (relation key, foreign key) pair with default values applied.
+
+        :param parent_cls: Relation model class.
+        :type parent_cls: ASQLModel
+        :rtype: tuple
+        """
+        return (
+            self.relation_key if self.relation_key is not None else parent_cls.get_pk(),
+            self.foreign_key if self.foreign_key is not None else '%s_%s' % (parent_cls.get_resource(),
+                                                                            parent_cls.get_pk()),
+        )
+
+    def _pick(self, models):
+        """Returns relation data of the loaded models.
+
+        :param models: Models related to one parent model.
+        :type models: list<ASQLModel>
+        :rtype: ASQLModel|list<ASQLModel>
+        """
+        return models[0] if len(models) else None
+
+    def preload(self, parent_models, chunk_size=1000):
+        """Loads relation data of all parent models with one "IN" query per chunk of relation values.
+        Relations with select, group, having, limit or offset are loaded model by model.
+
+        :param parent_models: Relation models of the same class.
+        :type parent_models: list<ASQLModel>
+        :param chunk_size: Maximum number of relation values per query.
+        :type chunk_size: int
         :rtype: None
         """
-        relation_value = self._get_relation_value()
+        if not len(parent_models):
+            return
+
+        if self.select is not None or self.group is not None or self.having is not None \
+                or self.limit is not None or self.offset is not None:
+            for parent_model in parent_models:
+                self.__get_data(parent_model)
+            return
+
+        template = self._get_template(parent_models[0].__class__)
+        parents = dict()
+        values = []
+
+        for parent_model in parent_models:
+            value = parent_model.get_attr(template.relation_key)
+            if value is not None:
+                if str(value) not in parents:
+                    parents[str(value)] = []
+                    values.append(value)
+                parents[str(value)].append(parent_model)
+
+        found = dict()
+
+        for i in range(0, len(values), chunk_size):
+            for model, key in self.__find_related(template, values[i:i + chunk_size]):
+                found.setdefault(str(key), []).append(model)
+
+        for key, models in parents.items():
+            data = self._pick(found.get(key, []))
+            for parent_model in models:
+                self.__cache.set(parent_model, parent_model.get_attr(template.relation_key), data)
+
+    def __find_related(self, template, values):
+        """Finds models related to any of the given relation values.
+
+        :param template: Relation query template.
+        :type template: RelationTemplate
+        :param values: Relation values.
+        :type values: list
+        :rtype: list<tuple(ASQLModel, str)>
+        """
+        params = dict(self.params, preload_values=values)
+        where = template.where + '%s IN :preload_values' % template.column
 
-        if self.through is not None:
-            if self.through.relation_key is None:
-                self.through.relation_key = '%s_%s' % (
-                    self.model_cls.get_resource(),
-                    self.model_cls.get_pk()
-                )
+        if not template.through:
+            result = self.model_cls.find(joins=template.joins, where=where, distinct=self.distinct, order=self.order,
+                                         params=params, **self.kwargs)
+            return [(model, model.get_attr(template.foreign_key)) for model in result]
 
-            if self.through.foreign_key is None:
-                self.through.foreign_key = self.model_cls.get_pk()
+        result = self.model_cls.find(
+            select='%s.*, %s AS pyar_preload_key' % (self.model_cls.get_resource(), template.column),
+            joins=template.joins, where=where, distinct=self.distinct, order=self.order, params=params, **self.kwargs
+        )
 
-            self.joins = '' if self.joins is None else self.joins + ' '
+        ret = []
 
-            self.joins += 'LEFT JOIN %s ON (%s.%s = %s.%s)' % (
-                self.through.model_cls.get_resource(),
+        for model in result:
+            key = model.get_attr('pyar_preload_key')
+            model.del_attr('pyar_preload_key')
+            model.mark_clean()
+            ret.append((model, key))
 
-                self.through.model_cls.get_resource(),
-                self.through.relation_key,
+        return ret
 
-                self.model_cls.get_resource(),
-                self.through.foreign_key,
-            )
+    @staticmethod
+    def preload_models(models, relations, chunk_size=1000):
+        """Loads relations of all models with one query per relation and chunk instead of one query per model.
 
-            self.where = '' if self.where is None else self.where + ' AND '
+        :param models: PyAR sql models.
+        :type models: list<ASQLModel>
+        :param relations: Relation names, nested relations are separated by dot (e.g. "tasks.owner").
+        :type relations: list
+        :param chunk_size: Maximum number of relation values per query.
+        :type chunk_size: int
+        :rtype: list<ASQLModel>
+        """
+        for path in relations:
+            current = [model for model in models if model is not None]
 
-            if self.through.through_relation_key is None:
-                self.through.through_relation_key = '%s_%s' % (
-                    self.parent_model.get_resource(),
-                    self.parent_model.get_pk()
-                )
+            for name in path.split('.'):
+                groups = dict()
+                for model in current:
+                    groups.setdefault(model.__class__, []).append(model)
 
-            self.where += '(%s.%s = :foreign_key)' % (
-                self.through.model_cls.get_resource(),
-                self.through.through_relation_key,
-            )
-            self.params.update({'foreign_key': relation_value})
-        else:
-            self.kwargs.update({self.foreign_key: relation_value})
+                current = []
+
+                for model_cls, group in groups.items():
+                    model_cls.get_relation(name).preload(group, chunk_size)
+
+                    for model in group:
+                        value = getattr(model, name)
+                        if isinstance(value, list):
+                            current.extend(value)
+                        elif value is not None:
+                            current.append(value)
+
+        return models
 
     def __get_data(self, parent_model):
-        """Loads relation data and stores it into self.__data attribute.
+        """Returns cached relation data. Loads and caches it if it isn't cached yet
+        or the relation value of the parent model has been changed.
 
         :param parent_model: Relation model.
         :type parent_model: ASQLModel
         :rtype: ASQLModel|list<ASQLModel>
         """
-        parent_model_hash = hash(parent_model)
-        if parent_model_hash not in self.__data:
-            self.parent_model = parent_model
-            self.__data[parent_model_hash] = self.load()
+        relation_value = parent_model.get_attr(self._get_template(parent_model.__class__).relation_key)
+        found, data = self.__cache.get(parent_model, relation_value)
+
+        if not found:
+            data = self.load(parent_model)
+            self.__cache.set(parent_model, relation_value, data)
+
+        return data
 
-        return self.__data[parent_model_hash]
+    def reload(self, parent_model):
+        """Loads relation data of the parent model again and returns it.
+
+        :param parent_model: Relation model.
+        :type parent_model: ASQLModel
+        :rtype: ASQLModel|list<ASQLModel>
+        """
+        self.invalidate(parent_model)
+        return self.__get_data(parent_model)
+
+    def invalidate(self, parent_model=None):
+        """Removes cached relation data of the parent model or of all models if parent model isn't specified.
+
+        :param parent_model: Relation model.
+        :type parent_model: ASQLModel
+        :rtype: None
+        """
+        if parent_model is None:
+            self.__cache.clear()
+        else:
+            self.__cache.remove(parent_model)
 
-    def load(self):
+    def load(self, parent_model):
         """Loads relation data.
 
+        :param parent_model: Relation model.
+        :type parent_model: ASQLModel
         :rtype: ASQLModel|list<ASQLModel>
         """
         pass
@@ -504,63 +1468,75 @@ class HasManyRelation(Relation):
     """A "has many" association sets up a one-to-many relation with another model,
     such that each instance of the declaring model "has many" list of instances of the other model."""
 
-    def load(self):
-        """Loads relation data.
+    def _pick(self, models):
+        """Returns relation data of the loaded models.
 
+        :param models: Models related to one parent model.
+        :type models: list<ASQLModel>
         :rtype: list<ASQLModel>
         """
-        if self.relation_key is None:
-            self.relation_key = self.parent_model.get_pk()
-
-        if self.foreign_key is None:
-            self.foreign_key = '%s_%s' % (self.parent_model.get_resource(), self.parent_model.get_pk())
+        return models
 
-        self._prepare_filters()
+    def load(self, parent_model):
+        """Loads relation data.
 
-        return self.model_cls.find(select=self.select, distinct=self.distinct, group=self.group, joins=self.joins,
-                                   limit=self.limit, offset=self.offset, order=self.order, where=self.where,
-                                   params=self.params, **self.kwargs)
+        :param parent_model: Relation model.
+        :type parent_model: ASQLModel
+        :rtype: list<ASQLModel>
+        """
+        return self.model_cls.find(limit=self.limit, **self._get_query(parent_model))
 
 
 class HasOneRelation(Relation):
     """A "has one" association sets up a one-to-one relation with another model,
     such that each instance of the declaring model "has one" one instance of the other model."""
 
-    def load(self):
+    def load(self, parent_model):
         """Loads relation data.
 
+        :param parent_model: Relation model.
+        :type parent_model: ASQLModel
         :rtype: ASQLModel
         """
-        if self.relation_key is None:
-            self.relation_key = self.parent_model.get_pk()
-
-        if self.foreign_key is None:
-            self.foreign_key = '%s_%s' % (self.parent_model.get_resource(), self.parent_model.get_pk())
-
-        self._prepare_filters()
-
-        return self.model_cls.find_one(select=self.select, distinct=self.distinct, group=self.group, joins=self.joins,
-                                       limit=self.limit, offset=self.offset, order=self.order, where=self.where,
-                                       params=self.params, **self.kwargs)
+        return self.model_cls.find_one(**self._get_query(parent_model))
 
 
 class BelongToRelation(Relation):
     """A "belong to" association sets up a one-to-one relation with another model,
     such that each instance of the declaring model "belongs to" one instance of the other model."""
 
-    def load(self):
+    def _get_keys(self, parent_cls):
+        """Returns (relation key, foreign key) pair with default values applied.
+
+        :param parent_cls: Relation model class.
+        :type parent_cls: ASQLModel
+        :rtype: tuple
+        """
+        return (
+            self.relation_key if self.relation_key is not None else '%s_%s' % (self.model_cls.get_resource(),
+                                                                              self.model_cls.get_pk()),
+            self.foreign_key if self.foreign_key is not None else self.model_cls.get_pk(),
+        )
+
+    def load(self, parent_model):
         """Loads relation data.
 
+        :param parent_model: Relation model.
+        :type parent_model: ASQLModel
         :rtype: ASQLModel
         """
-        if self.relation_key is None:
-            self.relation_key = '%s_%s' % (self.model_cls.get_resource(), self.model_cls.get_pk())
+        return self.model_cls.find_one(**self._get_query(parent_model))
 
-        if self.foreign_key is None:
-            self.foreign_key = self.model_cls.get_pk()
 
-        self._prepare_filters()
+def preload(models, *relations, chunk_size=1000):
+    """Loads relations of all models with one query per relation and chunk instead of one query per model.
 
-        return self.model_cls.find_one(select=self.select, distinct=self.distinct, group=self.group, joins=self.joins,
-                                       limit=self.limit, offset=self.offset, order=self.order, where=self.where,
-                                       params=self.params, **self.kwargs)
\ No newline at end of file
+    :param models: PyAR sql models.
+    :type models: list<ASQLModel>
+    :param relations: Relation names, nested relations are separated by dot (e.g. "tasks.owner").
+    :type relations: str
+    :param chunk_size: Maximum number of relation values per query.
+    :type chunk_size: int
+    :rtype: list<ASQLModel>
+    """
+    return Relation.preload_models(models, relations, chunk_size)
@@ -0,0 +1,123 @@
+"""
+    PyAR sharding adapter tests.
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :license:
+        This code is a part of Communication Interface for Import/Export,
+        which is a proprietary subject of its rightful owners. Any form of
+        copy or distribution is forbidden without written permission.
+
+    :copyright:
+        Copyright (c) 2014 symmetrics - a CGI Group brand
+
+    :author:
+        symmetrics - a CGI Group brand <info@symmetrics.de>
+        Oleg Bronzov <oleg.bronzov@symmetrics.de>
+"""
+
+import collections
+import unittest
+
+from pyar import PyAR, AAdapter, ASQLModel, ShardedAdapter, HashShardStrategy, RangeShardStrategy, \
+    DirectoryShardStrategy, AdapterConfigKeyException
+
+
+class MemoryShard(AAdapter):
+    """Shard which keeps rows in memory and filters them by equality conditions."""
+
+    __options = ('select', 'joins', 'where', 'having', 'distinct', 'group', 'params', 'query', 'use_index',
+                 'force_index', 'chunk_size', 'raw')
+
+    def __init__(self):
+        self.rows = []
+        self.transactions = 0
+        super().__init__()
+
+    def read(self, model_cls, limit=None, offset=None, order=None, stream=False, **kwargs):
+        keys = dict((key, value) for key, value in kwargs.items() if key not in self.__options)
+        rows = [row for row in self.rows if all(row.get(key) == value for key, value in keys.items())]
+        rows = rows[offset or 0:(offset or 0) + limit if limit is not None else None]
+        models = [model_cls(dict(row), False) for row in rows]
+        return iter(models) if stream else models
+
+    def create(self, model, **kwargs):
+        self.rows.append(dict(model.get_data(False)))
+        return True
+
+    def build_read_query(self, model_cls, select=None, **kwargs):
+        return 'SELECT %s FROM %s' % (select, model_cls.get_resource())
+
+    def read_rows(self, query, params=None, cursor_type=None):
+        return [(len(self.rows),)]
+
+    def start_transaction(self):
+        self.transactions += 1
+
+    def commit_transaction(self):
+        pass
+
+    def rollback_transaction(self):
+        pass
+
+    def get_last_query(self):
+        return ''
+
+    def get_last_result(self):
+        return collections.namedtuple('Result', 'lastrowid')(None)
+
+
+class Project(ASQLModel):
+    _read_adapter_ = 'test_sharding'
+    _write_adapter_ = 'test_sharding'
+
+
+class ShardedAdapterTest(unittest.TestCase):
+    """Rows are read from the shard they were written to."""
+
+    def assert_round_trip(self, strategy, ids):
+        shards = [MemoryShard(), MemoryShard(), MemoryShard()]
+        PyAR.add_adapter(ShardedAdapter(shards, 'id', strategy), 'test_sharding')
+
+        for id in ids:
+            Project({'id': id, 'title': 'project %s' % id}).save()
+
+        self.assertEqual(sum(len(shard.rows) for shard in shards), len(ids))
+
+        for id in ids:
+            project = Project.find_by_id(id)
+            self.assertIsNotNone(project)
+            self.assertEqual(project.id, id)
+
+        return shards
+
+    def test_hash_strategy(self):
+        self.assert_round_trip(HashShardStrategy(), [1, 2, 3, 5, 8, 13])
+
+    def test_range_strategy(self):
+        shards = self.assert_round_trip(RangeShardStrategy([10, 20]), [5, 15, 25])
+        self.assertEqual([[row['id'] for row in shard.rows] for shard in shards], [[5], [15], [25]])
+
+    def test_directory_strategy(self):
+        shards = self.assert_round_trip(DirectoryShardStrategy({5: 1, 6: 2}, default=0), [5, 6, 7])
+        self.assertEqual([[row['id'] for row in shard.rows] for shard in shards], [[7], [5], [6]])
+
+    def test_merged_stream(self):
+        shards = self.assert_round_trip(RangeShardStrategy([10, 20]), [25, 5, 15, 6, 16, 26])
+        adapter = PyAR.get_adapter('test_sharding')
+
+        for shard in shards:
+            shard.rows.sort(key=lambda row: row['id'])
+
+        rows = adapter.iter_read(Project, order='id', limit=3, offset=2)
+        self.assertEqual([model.id for model in rows], [15, 16, 25])
+
+    def test_count_of_all_shards(self):
+        self.assert_round_trip(RangeShardStrategy([10, 20]), [5, 6, 15, 25])
+        self.assertEqual(Project.count(), 4)
+
+    def test_shard_key_is_required(self):
+        self.assertRaises(AdapterConfigKeyException, ShardedAdapter, [MemoryShard()], None)
+
+
+if __name__ == '__main__':
+    unittest.main()